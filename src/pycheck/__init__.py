@@ -7,9 +7,11 @@
     tools are intended to be used during development and debugging. 
 '''
 
-from .proxy import type_proxy
+from .proxy import type_proxy, resolve_all
+from .protocols import protocol
+from .config import configure
 
-__all__ = ['checked', 'type_proxy', 'TypeDeclarationViolation']
+__all__ = ['checked', 'type_proxy', 'resolve_all', 'protocol', 'configure', 'TypeDeclarationViolation']
 
 #TODO: how to specify that return type is a tuple of heterogeneous types?
 # (probably with a special helper class)s
@@ -18,11 +20,18 @@ from pycheck.checked_helpers import TypeDeclarationViolation
 if __debug__:
     import functools
     import inspect
-    import sys
-    from pycheck.checked_helpers import (check_args, check_kwds, check_return)
-    from types import GeneratorType
+    from pycheck.budget import CheckBudget
+    from pycheck.checked_helpers import prepare_annotations
+    from pycheck.conditions import make_conditions
+    from pycheck.config import settings, VIOLATION_MODES
+    from pycheck.protocols import patch_annotations
+    from pycheck.proxy import forward_refs
+    from pycheck.report import TokenBucket
+    from pycheck.wrapper import CheckedFunction
 
-    def checked(f): 
+    def checked(f=None, *, budget_us=None, cooldown=1.0, degrade='shallow', sample_size=32,
+                on_violation=None, report_rate=None, report_burst=None, deferred=None,
+                requires=None, ensures=None, trace=None): 
         '''
         checked is a function decorator that uses function annotations as type declarations
         and verifies that the function has been passed, and is returning, the 
@@ -76,6 +85,10 @@ if __debug__:
               This usage means that the function ruturns a collection of type <collection type> 
               (e.g. set, list, tuple, etc.), which contains only elements of type <element type>.
               
+              Subclasses of <collection type> match too, as do classes registered with it when
+              it is an abstract base class: {Sequence:int} accepts lists, tuples and ranges of 
+              integers. If several collection types match, the nearest base class wins.
+              
               Example: 
                   ``def f(x) -> {set:int}: # f() must return a set of integers``
 
@@ -88,6 +101,62 @@ if __debug__:
                   ``def f( x: lambda x: x > 0 ): # f() only accepting values greater than zero``
                   
                   ``def g(x) -> lambda y: y >= 0: # g() must return a value >= 0``
+
+            * A string naming a type, "package.module:Name", or just "Name" for a type defined
+              in the same module as the function. Use this to refer to types which aren't
+              defined yet when the function is, e.g. because of circular imports. The names
+              are looked up by the first call of the function, or by pycheck.resolve_all().
+              
+              Example
+                  ``def f(x) -> "myapp.models:Order": # f() must return a myapp.models.Order``
+
+            * A protocol: pycheck.protocol(<attribute name>, ...), or a subclass of typing.Protocol,
+              to accept any value whose type has the listed attributes or methods. Each type is
+              only examined once; see pycheck.protocol().
+              
+              Example
+                  ``def f(x:protocol('read', 'close')): # f() accepts any file-like object``
+        
+        
+        WHOLE-CALL CONDITIONS
+        ---------------------
+        A condition which involves more than one parameter can be given to @checked itself. 
+        Its parameters are named after the parameters of the function, and a postcondition
+        may also take the return value as ``result``:
+        
+            @checked(requires=lambda lo, hi: lo <= hi,
+                     ensures=lambda result, lo, hi: lo <= result <= hi)
+            def clamp(x:int, lo:int=0, hi:int=100) -> int:
+                ....
+                
+        requires and ensures may also be lists of conditions. Preconditions are checked after
+        the parameter types, postconditions after the return type. (Postconditions aren't
+        checked for generators.)
+        
+        
+        TRACING
+        -------
+        @checked(trace=True), or pycheck.configure(trace=True), records the types actually
+        passed to and returned from the function in a sample of its calls, to help choose
+        its annotations. pycheck.trace.trace_module() does the same for every function of a
+        module which hasn't been annotated yet. See pycheck.trace.
+        
+        
+        PROFILING
+        ---------
+        To find out which functions checking is slowing down, run the program with
+        
+            python -m pycheck.profile script.py [args ...]
+            
+        which ranks the @checked functions by the time spent checking their calls, and shows
+        the declaration of each which is the most expensive to check. See pycheck.profile.
+        
+        To check packages during a test session without decorating their functions, and
+        see which tests checking slows down, use the pytest plugin: 
+        
+            pytest -p pycheck.pytest_plugin --pycheck=mypackage
+            
+        See pycheck.pytest_plugin.
         
         
         DEFAULTS, *ARG, AND **KWD
@@ -99,16 +168,90 @@ if __debug__:
             def function(x:<type declaration>, y:<type declaration>=1, *args:<type declaration>, **kwds:<type declaration):
         
         
+        METHODS
+        -------
+        @checked may go either side of @classmethod, @staticmethod and @property (or a 
+        property's .setter):
+        
+            class Shape:
+                @checked
+                @classmethod
+                def unit(cls, side:int=1):
+                    ....
+                    
+                @property
+                @checked
+                def area(self) -> float:
+                    ....
+                    
+        Parameters without a declaration, such as self and cls, aren't looked at. The
+        function is replaced by a small CheckedFunction object (see pycheck.wrapper), which 
+        is bound to an instance the way a function is.
+        
+        
+        CHECK BUDGET:
+        -------------
+        Checking a collection declaration such as {list:int} means looking at every element,
+        so the cost of checking a call depends on its arguments. A function may declare
+        how much checking it can afford per call, in microseconds:
+        
+            @checked(budget_us=50)
+            def function(x:{list:int}):
+                ...
+                
+        When the checks of a call take longer than the budget, collection declarations of
+        that function are checked shallowly (only the collection type is checked) for the
+        next ``cooldown`` seconds. With ``degrade='sample'`` only ``sample_size`` elements,
+        spread across the collection, are checked instead. Each downgrade is counted in the
+        function's stats; see pycheck.stats.get_stats() and pycheck.stats.downgraded().
+        
+        When the same large tuples or frozensets are passed again and again, 
+        pycheck.configure(memo=True) remembers the ones which have passed a full check and
+        hold nothing mutable, so that checking them again costs a lookup rather than a
+        scan. See pycheck.memo.
+        
+        
+        REPORTING INSTEAD OF RAISING:
+        -----------------------------
+        By default a violation raises TypeDeclarationViolation. With on_violation='log', given
+        to @checked or set for the whole process with pycheck.configure(), violations are
+        logged instead and the call carries on. Repeats of the same violation (same function,
+        parameter, declared type and actual type) are counted rather than logged, with a
+        periodic summary of the count; logging is rate limited both globally
+        (configure(report_rate=..., report_burst=...)) and, optionally, per function:
+        
+            @checked(on_violation='log', report_rate=0.1)
+            def function(x:int):
+                ...
+        
+        See pycheck.report, and pycheck.log for keeping a compact binary log of violations.
+        
+        To find out which calls are passing the wrong types, pycheck.configure(callers=True)
+        adds the file, line and function of the offending call to each violation, reports
+        violations separately for each call site, and counts them per call site in the
+        function's stats. With configure(callers_sample_rate=N) one call in N is counted
+        per call site as well (and, while profiling, its check time). The call site is found
+        with a single frame lookup, and only for violations and sampled calls.
+        
+        
+        DEFERRED CHECKING:
+        ------------------
+        To keep checking off the critical path of a call, @checked(deferred=True) (or
+        pycheck.configure(deferred=True)) hands the checks of immutable arguments and return 
+        values -- ints, strs, tuples and frozensets of those, frozen dataclasses, etc. -- to a
+        background thread. Mutable values are checked inline as usual, or not at all with 
+        configure(deferred_mutable='skip'). Violations found by the background thread are 
+        reported as for on_violation='log'. If the background thread falls behind, checks are 
+        dropped rather than making the caller wait. See pycheck.deferred.
+        
+        
         DEBUG MODE:
         -----------------------------
         @checked is intended to be used as a tool during 
         development and testing to help identify errors more quickly. For
         this reason ``@checked`` is only functional in debug mode
-        (i.e. when ``__debug__ == True``). If not in debug mode it is defined
-        simply as,
-        
-            def checked(f):
-                return f
+        (i.e. when ``__debug__ == True``). If not in debug mode it simply
+        returns the function it decorates (with or without options).
                 
         
         MOTIVATION:
@@ -149,8 +292,9 @@ if __debug__:
                           ...do something special...
             
         * If the annotations are callable objects, they can only operate on a single parameter, or the return,
-          value. The validation cannot evaluate all of the parameters -- for example you can't write a
-          pre-condition that checks that the parameters are ordered from least to greatest.
+          value. Conditions which evaluate several parameters -- for example a pre-condition that checks
+          that the parameters are ordered from least to greatest -- must be given to @checked with 
+          requires= and ensures= instead (see WHOLE-CALL CONDITIONS).
         
         
         KNOWN ISSUES:
@@ -158,39 +302,39 @@ if __debug__:
         Although an error is raised as it should be, the text of the error message for a container containing and 
         element of the wrong type is not clear
         '''
-                                
-        @functools.wraps(f)
-        def checked_f(*args:list, **kwds:dict):  
-            argspec = inspect.getfullargspec(f)
-            
-            try:          
-                check_args(f, args, argspec)
-                check_kwds(f, kwds, argspec)
-            except TypeDeclarationViolation as e:
-                # It would be confusing to the user to see a big stack of our function calls
-                # here in the stack trace when an error is detected, so if we're in 3.3 or higher
-                # we supress the rest of our own stack trace by the "raise Exception from None"
-                # technique.
-                raise TypeDeclarationViolation(str(e)) from (None if sys.version >= '3.3' else e)                
-    
-            # Since errors thrown here have to do with the actual implementation of the
-            # checked function, f, we don't want to re-wrap any exceptions thrown
-            # since they are actually caused by the user's code.
-            rvalue = f(*args, **kwds)
-            try:                
-            
-                if isinstance(rvalue, GeneratorType):
-                    def checked_gen():
-                        for value in rvalue:
-                            yield check_return(f, value, argspec)
-                    return checked_gen()
-                else:
-                    return check_return(f, rvalue, argspec) 
-            except TypeDeclarationViolation as e:
-                raise TypeDeclarationViolation(str(e)) from (None if sys.version >= '3.3' else e)
-            
-        return checked_f
+        
+        options = dict(budget_us=budget_us, cooldown=cooldown, degrade=degrade, 
+                       sample_size=sample_size, on_violation=on_violation, report_rate=report_rate, 
+                       report_burst=report_burst, deferred=deferred, requires=requires, 
+                       ensures=ensures, trace=trace)
+        if f is None:
+            # called with options, as in @checked(budget_us=50)
+            return functools.partial(checked, **options)
+        
+        # applied on top of @classmethod, @staticmethod or @property: check what they wrap
+        if isinstance(f, (classmethod, staticmethod)):
+            return type(f)(checked(f.__func__, **options))
+        if isinstance(f, property):
+            return property(*[None if g is None else checked(g, **options) 
+                              for g in (f.fget, f.fset, f.fdel)], doc=f.__doc__)
+        
+        if on_violation is not None and on_violation not in VIOLATION_MODES:
+            raise ValueError("on_violation must be one of %s, not %r" % (VIOLATION_MODES, on_violation))
+        
+        argspec = inspect.getfullargspec(f)
+        patch_annotations(argspec.annotations)
+        prepare_annotations(argspec.annotations)
+        refs = forward_refs(argspec.annotations, f.__module__)
+        preconditions = make_conditions(f, argspec, requires)
+        postconditions = make_conditions(f, argspec, ensures, result=True)
+        budget = None if budget_us is None else CheckBudget(budget_us, cooldown, degrade, sample_size)
+        bucket = (None if report_rate is None 
+                  else TokenBucket(report_rate, settings.report_burst if report_burst is None else report_burst))
+        return CheckedFunction(f, argspec, refs, preconditions, postconditions, budget, bucket,
+                               on_violation, deferred, trace)
 
 else:
-    def checked(f):
+    def checked(f=None, **options):
+        if f is None:
+            return checked
         return f
@@ -0,0 +1,48 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Check-time budgets for @checked functions. See checked(budget_us=...).
+'''
+from time import perf_counter
+
+SHALLOW = 'shallow'
+SAMPLE = 'sample'
+
+
+class CheckBudget:
+    '''Tracks the time spent checking the calls of a single function.
+
+    When the checks of a call take longer than budget_us microseconds the function is
+    degraded for the next ``cooldown`` seconds: collection declarations are checked
+    shallowly (the collection type only, ``degrade='shallow'``) or by checking only
+    ``sample_size`` of the elements (``degrade='sample'``). Each downgrade is counted
+    in the function's stats.
+    '''
+    def __init__(self, budget_us, cooldown=1.0, degrade=SHALLOW, sample_size=32):
+        if degrade not in (SHALLOW, SAMPLE):
+            raise ValueError("degrade must be %r or %r, not %r" % (SHALLOW, SAMPLE, degrade))
+        self.budget = budget_us / 1e6
+        self.cooldown = cooldown
+        self.sample = 0 if degrade == SHALLOW else sample_size
+        self.degraded_until = 0.0
+
+    def sample_size(self, now):
+        '''Return the number of collection elements to check for a call starting at
+        time ``now``: None (check everything) unless the function is cooling down.'''
+        if now < self.degraded_until:
+            return self.sample
+        return None
+
+    def charge(self, now, elapsed, sample, stats):
+        '''Charge ``elapsed`` seconds of checking, done with the given sample size,
+        against the budget.'''
+        if elapsed <= self.budget:
+            return
+        if sample is None:
+            stats.downgrades += 1
+            stats.last_overrun_us = elapsed * 1e6
+        # even degraded checks can run over (e.g. a slow condition check); keep
+        # cooling down rather than flapping back to full checks.
+        self.degraded_until = now + self.cooldown
@@ -5,6 +5,9 @@ Created on Jan 20, 2013
 '''
 from inspect import isfunction, ismethod 
 import itertools
+from pycheck.config import settings
+from pycheck.memo import is_immutable, verdicts
+from pycheck.typecache import TypeCache
 
 
 class TypeDeclarationViolation(AssertionError):
@@ -12,13 +15,41 @@ class TypeDeclarationViolation(AssertionError):
     or returned from a function call does not match the declaration
     indicated by the annotation.
     '''
+    # Violations raised by raise_error() and raise_return_error() don't format
+    # their message until it is asked for, since a violation which is only going
+    # to be counted (see pycheck.report) never needs it. details is
+    # (f, position, argname, value, declared_types, actual_types, ...)
+    formatter = None
+    details = ()
+    # (code object, line number) of the call which caused the violation, when
+    # callers are being attributed (see configure(callers=True))
+    call_site = None
+
+    def __str__(self):
+        if self.formatter is not None and not self.args:
+            message = self.formatter(*self.details)
+            if self.call_site is not None:
+                message += ' Called from %s.' % format_call_site(self.call_site)
+            self.args = (message,)
+        return AssertionError.__str__(self)
+
+    @property
+    def signature(self):
+        '''A compact, hashable description of the violation: the function, the
+        parameter position and name, the declared type, the actual type and the call
+        site (if known). Repeats of the same mistake have the same signature whatever 
+        the values.'''
+        if not self.details:
+            return None
+        f, position, argname, _, declared_types, actual_types = self.details[:6]
+        return (f, position, argname, type_key(declared_types), type_key(actual_types), self.call_site)
 
 try:
     # python 3.3+    
-    from collections.abc import Iterable, Mapping
+    from collections.abc import Iterable, KeysView, Mapping, Sequence
 except ImportError:
     # python < 3.3    
-    from collections import Iterable, Mapping
+    from collections import Iterable, KeysView, Mapping, Sequence
     
 if hasattr(object, '__qualname__'):
     # python 3.3+
@@ -29,6 +60,10 @@ else:
     def get_name(obj):
         return obj.__name__ 
 
+def format_call_site(call_site):
+    code, lineno = call_site
+    return '%s:%d, in %s()' % (code.co_filename, lineno, getattr(code, 'co_qualname', code.co_name))
+
 def get_type_str(type_declaration):
     try:
         return get_name(type_declaration)
@@ -36,6 +71,14 @@ def get_type_str(type_declaration):
         return ('None' if type_declaration is None 
                 else ', '.join(get_name(t) for t in type_declaration) )
 
+def type_key(type_declaration):
+    '''Return a hashable equivalent of a type declaration.'''
+    if isinstance(type_declaration, Mapping):
+        return tuple(type_declaration.items())
+    if isinstance(type_declaration, (set, frozenset, KeysView)):
+        return frozenset(type_declaration)
+    return type_declaration
+
 def get_value_str(value):
     rep = str(value)
     if len(rep) > 32:
@@ -45,25 +88,114 @@ def get_value_str(value):
 
 def check_condition(f, position, argname, argval, check_fcn):
     if not check_fcn(argval):
-        raise_error(f, position, argname, argval, declared_types=(), condition=True)
+        raise_error(f, position, argname, argval, declared_types=check_fcn, condition=True)
+        
+def sample_items(collection, sample):
+    '''Return at most ``sample`` elements of collection, spread evenly across it
+    when the collection supports indexing.'''
+    if sample == 0:
+        return ()
+    if isinstance(collection, Sequence):
+        n = len(collection)
+        if n <= sample:
+            return collection
+        step = n // sample
+        return tuple(collection[i] for i in range(0, step * sample, step))
+    return tuple(itertools.islice(collection, sample))
+
+def check_invariant(f, kind, check_fcn, argnames, argvals, n_keyword=0):
+    # kind is 'precondition' or 'postcondition'. The last n_keyword of argnames are
+    # keyword-only parameters of check_fcn.
+    if n_keyword:
+        n = len(argvals) - n_keyword
+        passed = check_fcn(*argvals[:n], **dict(zip(argnames[n:], argvals[n:])))
+    else:
+        passed = check_fcn(*argvals)
+    if not passed:
+        raise violation(format_invariant_error, f, None, kind, argvals, check_fcn, None, argnames)
         
-def check_collection_contents(f, position, argname, collection, declared_type):
-    if not all( isinstance(item, declared_type) for item in collection ):
-        bad_types = set( type(i) for i in collection if type(i) is not declared_type )
-        bad_values = set( v for v in collection if type(v) in bad_types )
+def check_collection_contents(f, position, argname, collection, declared_type, sample=None):
+    # sample is None for a full check, otherwise the number of elements to check
+    # (0 for a shallow check of the collection type only).
+    items = collection if sample is None else sample_items(collection, sample)
+    if not all( isinstance(item, declared_type) for item in items ):
+        bad_types = set( type(i) for i in items if type(i) is not declared_type )
+        bad_values = set( v for v in items if type(v) in bad_types )
         raise_error(f, position, argname, bad_values, declared_types={type(collection):declared_type}, actual_types=bad_types)
 
+def check_memoized(f, position, argname, collection, declared_type, sample=None):
+    '''check_collection_contents() for a tuple or frozenset, skipping the check if the
+    same collection has already passed it. See pycheck.memo.'''
+    verdict = verdicts.get(collection, declared_type)
+    if verdict:
+        return
+    check_collection_contents(f, position, argname, collection, declared_type, sample)
+    if verdict is None and sample is None:
+        verdicts.remember(collection, declared_type, is_immutable(collection))
+
+
+class ContainerDeclaration(dict):
+    '''A {<collection type> : <element type>} declaration taken from an annotation.
+    
+    It remembers which of its collection types each concrete type of collection 
+    checked against it matched, so that matching a subclass, or a class registered
+    with an ABC, is a single lookup once the type has been seen.
+    '''
+    __slots__ = ('dispatch',)
+    
+    def __init__(self, *args, **kwds):
+        super().__init__(*args, **kwds)
+        self.dispatch = TypeCache()
+
+def find_collection_type(type_declaration, actual_type):
+    '''Return the collection type of type_declaration which actual_type matches: 
+    actual_type itself, its nearest base class in the declaration, or the first ABC 
+    in the declaration it is registered with. Returns None if there isn't one.'''
+    for base in actual_type.__mro__:
+        if base in type_declaration:
+            return base
+    for collection_type in type_declaration:
+        if isinstance(collection_type, type) and issubclass(actual_type, collection_type):
+            return collection_type
+    return None
+
+def prepare_annotations(annotations):
+    '''Replace the collection declarations in a function's annotations with 
+    ContainerDeclarations.'''
+    for name, declaration in list(annotations.items()):
+        if isinstance(declaration, Mapping) and not isinstance(declaration, ContainerDeclaration):
+            annotations[name] = ContainerDeclaration(declaration)
 
-def check_collection(f, position, argname, collection, type_declaration:Mapping):
+def check_collection(f, position, argname, collection, type_declaration:Mapping, sample=None):
     actual_type = type(collection)
-    if actual_type in type_declaration:
-        check_collection_contents(f, position, argname, collection, type_declaration[actual_type])
+    try:
+        collection_type = type_declaration.dispatch.data[id(actual_type)]
+    except KeyError:
+        collection_type = find_collection_type(type_declaration, actual_type)
+        type_declaration.dispatch[actual_type] = collection_type
+    except AttributeError:
+        # a plain mapping, not one prepared by prepare_annotations()
+        collection_type = (actual_type if actual_type in type_declaration 
+                           else find_collection_type(type_declaration, actual_type))
+        
+    if collection_type is not None:
+        if (settings.memo and (actual_type is tuple or actual_type is frozenset)
+            and len(collection) >= settings.memo_min_length):
+            check_memoized(f, position, argname, collection, type_declaration[collection_type], sample)
+        else:
+            check_collection_contents(f, position, argname, collection, type_declaration[collection_type], sample)
     
     else:
         raise_error(f, position, argname, collection, declared_types=type_declaration.keys())
 
 
-def check_declaration(f, position, argname, argval, declared_type):
+def is_predicate(declaration):
+    '''Return True if declaration is a predicate: a function or method, @checked or
+    not.'''
+    return (isfunction(getattr(declaration, '__wrapped__', declaration))
+            or ismethod(declaration))
+
+def check_declaration(f, position, argname, argval, declared_type, sample=None):
     
     none_is_valid = declared_type is None
                 
@@ -72,9 +204,9 @@ def check_declaration(f, position, argname, argval, declared_type):
         none_is_valid = True
                 
     if isinstance(declared_type, Mapping):
-        check_collection(f, position, argname, argval, declared_type)
+        check_collection(f, position, argname, argval, declared_type, sample)
         
-    elif isfunction(declared_type) or ismethod(declared_type):
+    elif is_predicate(declared_type):
         check_condition(f, position, argname, argval, declared_type)
                     
     elif not ( (argval is None and none_is_valid) 
@@ -83,7 +215,7 @@ def check_declaration(f, position, argname, argval, declared_type):
         raise_error(f, position, argname, argval, declared_types=declared_type )
 
 
-def check_return(f, rvalue, argspec):
+def check_return(f, rvalue, argspec, sample=None):
     if 'return' in argspec.annotations:
         rtype_declaration = argspec.annotations['return']
         
@@ -104,58 +236,79 @@ def check_return(f, rvalue, argspec):
             raise_error(f, None, 'return value', rvalue, rtype_declaration)
              
         elif isinstance(rtype_declaration, Mapping):
-            check_collection(f, None, 'return value', rvalue, rtype_declaration)
+            check_collection(f, None, 'return value', rvalue, rtype_declaration, sample)
 
-        elif isfunction(rtype_declaration) or ismethod(rtype_declaration):
+        elif is_predicate(rtype_declaration):
             check_condition(f, None, 'return value', rvalue, rtype_declaration)
                     
         elif not isinstance(rvalue, rtype_declaration):
-            raise TypeDeclarationViolation(
-                "%(func)s() -> <%(declared_rtype)s>: Actual type of return value, <%(rvalue)s>, is <%(actual_rtype)s>" 
-                % (dict(func=get_name(f), 
-                        declared_rtype=get_type_str(rtype_declaration), 
-                        actual_rtype=get_type_str(type(rvalue)),
-                        rvalue=get_value_str(rvalue))))
+            raise_return_error(f, rvalue, rtype_declaration)
      
     return rvalue 
 
+
+def violation(formatter, *details):
+    e = TypeDeclarationViolation()
+    e.formatter = formatter
+    e.details = details
+    return e
+
+def format_return_error(f, position, argname, rvalue, declared_rtype, actual_rtype):
+    return ("%(func)s() -> <%(declared_rtype)s>: Actual type of return value, <%(rvalue)s>, is <%(actual_rtype)s>" 
+            % (dict(func=get_name(f), 
+                    declared_rtype=get_type_str(declared_rtype), 
+                    actual_rtype=get_type_str(actual_rtype),
+                    rvalue=get_value_str(rvalue))))
+
+def raise_return_error(f, rvalue, rtype_declaration):
+    raise violation(format_return_error, f, None, 'return value', rvalue, rtype_declaration, type(rvalue))
+
             
 def raise_error(f, position, argname, argval, declared_types, actual_types=None, condition=False):
     if actual_types is None and not condition:
         actual_types = type(argval)
-    raise TypeDeclarationViolation(
-                    (
-                     "%(func)s(): "
-                     "%(parameter)s%(positional_info)s%(argname)s"
-                     "=%(value)s: "
-                     + ("Declared type=<%(declared_types)s>, " if not condition else "")
-                     + ("actual type=<%(actual_types)s>." if not condition else "")         
-                     + (" Fails condition check." if condition else "")
-                    ) % 
-                    dict(func=get_name(f), 
-                         parameter='Parameter ' if position is not None else '',
-                         positional_info="" if position is None else ("number %d, " % position), 
-                         argname=argname, 
-                         actual_types =get_type_str(actual_types), 
-                         declared_types=get_type_str(declared_types) if not condition else '', 
-                         value=get_value_str(argval)
-                         )
-                    )
-
-
-def check_arg(f, position, argname, argval, argspec):
+    raise violation(format_error, f, position, argname, argval, declared_types, actual_types, condition)
+
+def format_invariant_error(f, position, kind, argvals, check_fcn, actual_types, argnames):
+    return "%(func)s(): %(values)s: Fails %(kind)s check." % dict(
+                func=get_name(f),
+                values=', '.join('%s=%s' % (name, get_value_str(value)) 
+                                 for name, value in zip(argnames, argvals)),
+                kind=kind)
+
+def format_error(f, position, argname, argval, declared_types, actual_types, condition):
+    return ((
+             "%(func)s(): "
+             "%(parameter)s%(positional_info)s%(argname)s"
+             "=%(value)s: "
+             + ("Declared type=<%(declared_types)s>, " if not condition else "")
+             + ("actual type=<%(actual_types)s>." if not condition else "")         
+             + (" Fails condition check." if condition else "")
+            ) % 
+            dict(func=get_name(f), 
+                 parameter='Parameter ' if position is not None else '',
+                 positional_info="" if position is None else ("number %d, " % position), 
+                 argname=argname, 
+                 actual_types =get_type_str(actual_types), 
+                 declared_types=get_type_str(declared_types) if not condition else '', 
+                 value=get_value_str(argval)
+                 )
+            )
+
+
+def check_arg(f, position, argname, argval, argspec, sample=None):
     if argname in argspec.annotations:
         declared_type = argspec.annotations[argname]
-        check_declaration(f, position, argname, argval, declared_type)
+        check_declaration(f, position, argname, argval, declared_type, sample)
 
-def check_kwd(f, argname, argval, argspec):
+def check_kwd(f, argname, argval, argspec, sample=None):
     if argname in argspec.annotations:
         # parameter is a "regular" parameter passed in as a kw:
         # def f(x:int):
         #    ...
         # f(x=1) 
         declared_type = argspec.annotations[argname]
-        check_declaration(f, None, argname, argval, declared_type)
+        check_declaration(f, None, argname, argval, declared_type, sample)
         
     elif ( argname not in argspec.args # not a formally named parameter
            and argspec.varkw in argspec.annotations ): # parameters list includes "**kwds"
@@ -167,13 +320,22 @@ def check_kwd(f, argname, argval, argspec):
         #    ...
         # f(x=1, y=2) # x & y will be handled by this branch
         declared_type = argspec.annotations[ argspec.varkw ]
-        check_declaration(f, None, argname, argval, declared_type)
+        check_declaration(f, None, argname, argval, declared_type, sample)
 
-def check_kwds(f, kwds, argspec):
+def check_kwds(f, kwds, argspec, sample=None, violated=None):
+    '''Check the keyword arguments of a call. If violated is given, it is called with
+    each violation, and the rest of the arguments are still checked.'''
     for argname in kwds:
-        check_kwd(f, argname, kwds[argname], argspec)
+        try:
+            check_kwd(f, argname, kwds[argname], argspec, sample)
+        except TypeDeclarationViolation as e:
+            if violated is None:
+                raise
+            violated(e)
                 
-def check_args(f, args, argspec): 
+def bind_args(args, argspec):
+    '''Return an iterator of (position, argname, argval) for the positional arguments
+    of a call.'''
     # extra args are positional only "*args" type of parameters.
     # the name of the *arg parameter is given by argspec.varags,
     # for for all of the extra positional parameters we pass that
@@ -188,6 +350,8 @@ def check_args(f, args, argspec):
     
     # if there are extra positional parameters (*args) then the zipped
     # list will look something like [ ('x',1), '('y',2), ('args',3), ('args',4)...]
-    position = itertools.count(1)
-    for (position, argname, argval) in zip(position, argspec.args + varargs, args):
-        check_arg(f, position, argname, argval, argspec)        
\ No newline at end of file
+    return zip(itertools.count(1), argspec.args + varargs, args)
+
+def check_args(f, args, argspec, sample=None): 
+    for (position, argname, argval) in bind_args(args, argspec):
+        check_arg(f, position, argname, argval, argspec, sample)
\ No newline at end of file
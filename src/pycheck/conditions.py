@@ -0,0 +1,100 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Whole-call preconditions and postconditions. See checked(requires=..., ensures=...).
+
+A condition is a callable whose parameters are named after parameters of the checked
+function (and, for postconditions, ``result`` for the return value):
+
+    @checked(requires=lambda lo, hi: lo <= hi,
+             ensures=lambda result, hi: result <= hi)
+    def clamp(x:int, lo:int=0, hi:int=100) -> int:
+        ...
+
+Binding the arguments of a call onto the condition's parameters is done by a small
+function generated for each condition when the function is decorated, which picks
+each value straight out of the call's args tuple or kwds dict, or uses the default.
+'''
+import inspect
+from pycheck.checked_helpers import Iterable, TypeDeclarationViolation, get_name, check_invariant
+
+RESULT = 'result'
+
+
+def _value_source(name, argspec, defaults, result):
+    '''Return the expression which fetches the value of parameter ``name`` in a
+    generated binder, adding any default value it needs to defaults.'''
+    if result and name == RESULT:
+        return 'result'
+    if name in argspec.args:
+        index = argspec.args.index(name)
+        first_default = len(argspec.args) - len(argspec.defaults or ())
+        if index >= first_default:
+            defaults.append(argspec.defaults[index - first_default])
+            fallback = 'kwds.get(%r, defaults[%d])' % (name, len(defaults) - 1)
+        else:
+            fallback = 'kwds[%r]' % name
+        return '(args[%d] if n > %d else %s)' % (index, index, fallback)
+    if name in argspec.kwonlyargs:
+        if argspec.kwonlydefaults and name in argspec.kwonlydefaults:
+            defaults.append(argspec.kwonlydefaults[name])
+            return 'kwds.get(%r, defaults[%d])' % (name, len(defaults) - 1)
+        return 'kwds[%r]' % name
+    if name == argspec.varargs:
+        return 'args[%d:]' % len(argspec.args)
+    if name == argspec.varkw:
+        return 'dict(kv for kv in kwds.items() if kv[0] not in named)'
+    return None
+
+def make_binder(f, argspec, names, result=False):
+    '''Generate a function bind(args, kwds, result) returning the values of the
+    parameters of f named by ``names`` for a call f(*args, **kwds). It raises
+    KeyError or IndexError if the call doesn't supply one of them.'''
+    defaults = []
+    sources = []
+    for name in names:
+        source = _value_source(name, argspec, defaults, result)
+        if source is None:
+            raise TypeError("condition parameter %r is not a parameter of %s()" % (name, get_name(f)))
+        sources.append(source)
+    code = ('def bind(args, kwds, result=None):\n'
+            '    n = len(args)\n'
+            '    return (%s)\n' % ''.join(s + ', ' for s in sources))
+    namespace = dict(defaults=defaults, named=frozenset(argspec.args + argspec.kwonlyargs))
+    exec(code, namespace)
+    return namespace['bind']
+
+def make_conditions(f, argspec, conditions, result=False):
+    '''Return a tuple of (condition, parameter names, number of keyword-only parameters,
+    binder) for the condition (or iterable of conditions) given to @checked.'''
+    if conditions is None:
+        return ()
+    if callable(conditions) or not isinstance(conditions, Iterable):
+        conditions = [conditions]
+    prepared = []
+    for condition in conditions:
+        spec = inspect.getfullargspec(condition)
+        names = spec.args + spec.kwonlyargs
+        if inspect.ismethod(condition):
+            names = names[1:]
+        prepared.append((condition, tuple(names), len(spec.kwonlyargs),
+                         make_binder(f, argspec, names, result)))
+    return tuple(prepared)
+
+def check_conditions(f, kind, conditions, args, kwds, result=None, violated=None):
+    '''Check the conditions of a call. If violated is given, it is called with each
+    violation, and the rest of the conditions are still checked.'''
+    for condition, names, n_keyword, bind in conditions:
+        try:
+            values = bind(args, kwds, result)
+        except (KeyError, IndexError):
+            # the call is missing an argument; calling f will raise a TypeError
+            return
+        try:
+            check_invariant(f, kind, condition, names, values, n_keyword)
+        except TypeDeclarationViolation as e:
+            if violated is None:
+                raise
+            violated(e)
@@ -0,0 +1,84 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Process-wide settings for pycheck. Use configure() to change them; options given
+to an individual @checked function take precedence over these.
+'''
+
+RAISE = 'raise'
+LOG = 'log'
+VIOLATION_MODES = (RAISE, LOG)
+
+INLINE = 'inline'
+SKIP = 'skip'
+MUTABLE_POLICIES = (INLINE, SKIP)
+
+
+class Settings:
+    '''The current pycheck settings.
+
+    on_violation     -- 'raise' to raise TypeDeclarationViolation (the default), or
+                        'log' to report the violation through pycheck.report and
+                        carry on with the call.
+    report_rate      -- violation reports per second allowed by the global rate limit.
+    report_burst     -- number of reports which may be made at once before the
+                        rate limit applies.
+    summary_interval -- minimum number of seconds between summaries of a repeated
+                        violation.
+    deferred         -- True to check immutable values on a background thread (see
+                        pycheck.deferred) for functions which don't say otherwise.
+    deferred_mutable -- what deferred checking does with mutable values: 'inline'
+                        to check them as usual, or 'skip' to leave them unchecked.
+    deferred_queue_size -- number of deferred checks which may wait to be made;
+                        further checks are dropped.
+    trace            -- True to record the types passed to and returned from every
+                        @checked function (see pycheck.trace).
+    trace_sample_rate -- trace one call in this many.
+    memo             -- True to remember the immutable tuples and frozensets which
+                        have passed their checks, so as not to check them again (see
+                        pycheck.memo).
+    memo_size        -- the most collections remembered at once.
+    memo_min_length  -- the fewest elements a collection needs to be remembered.
+    callers          -- True to find out which call caused each violation. The call
+                        site is added to the message, violations are reported per
+                        call site, and each function's stats count violations per
+                        call site (see pycheck.stats).
+    callers_sample_rate -- with callers, also count the call sites of one call in 
+                        this many in the stats (0 for none). While profiling, their 
+                        check time is added up per call site too.
+    profile          -- True to time the checks of every call of every @checked
+                        function, and of each of its parameters, into its stats
+                        (see pycheck.profile).
+    '''
+    on_violation = RAISE
+    report_rate = 1.0
+    report_burst = 10
+    summary_interval = 10.0
+    deferred = False
+    deferred_mutable = INLINE
+    deferred_queue_size = 10000
+    trace = False
+    trace_sample_rate = 16
+    memo = False
+    memo_size = 1024
+    memo_min_length = 16
+    callers = False
+    callers_sample_rate = 0
+    profile = False
+
+settings = Settings()
+
+
+def configure(**options):
+    '''Change the process-wide pycheck settings, e.g. configure(on_violation='log').
+    See Settings for the available options.'''
+    for name, value in options.items():
+        if name.startswith('_') or not hasattr(Settings, name):
+            raise TypeError("configure() got an unexpected option %r" % name)
+        if name == 'on_violation' and value not in VIOLATION_MODES:
+            raise ValueError("on_violation must be one of %s, not %r" % (VIOLATION_MODES, value))
+        if name == 'deferred_mutable' and value not in MUTABLE_POLICIES:
+            raise ValueError("deferred_mutable must be one of %s, not %r" % (MUTABLE_POLICIES, value))
+        setattr(settings, name, value)
@@ -0,0 +1,158 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Deferred checking: checks of immutable arguments and return values are handed to a
+background thread instead of being made on the caller's critical path. See
+checked(deferred=True).
+
+A value can only be checked after the call has returned if it can't have changed in
+the meantime, so only immutable values are deferred: ints, floats, strs, bytes and
+the like, tuples and frozensets of those, and instances of frozen dataclasses. What
+happens to the other (mutable) values depends on settings.deferred_mutable: they are
+either checked inline, as usual ('inline', the default), or not checked at all
+('skip').
+
+So that deferring costs the caller the same whatever the size of the value, the
+caller only looks at the type of a tuple or frozenset, not at its contents (see
+looks_immutable()). The background thread looks at the contents: one which holds
+something mutable is checked anyway, unless mutable values are skipped.
+
+Deferred checks wait in a bounded queue (settings.deferred_queue_size). When the
+queue is full new checks are dropped and counted (see dropped()) -- the caller never
+waits for the checker. Violations found by the background thread can't be raised in
+the caller, so they are always reported, as for on_violation='log'. A check which
+fails in some other way -- a predicate declaration which raises TypeError, say -- is
+logged and counted (see errors()).
+'''
+import logging
+import queue
+import threading
+from pycheck.checked_helpers import (bind_args, check_arg, check_kwd, check_return,
+                                     TypeDeclarationViolation)
+from pycheck.config import settings, INLINE
+from pycheck.memo import is_immutable, looks_immutable
+
+logger = logging.getLogger('pycheck')
+
+
+class DeferredChecker:
+    '''A bounded queue of checks and the daemon thread which makes them.'''
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize)
+        self.dropped = 0
+        self.errors = 0
+        self.thread = threading.Thread(target=self.run, name='pycheck-deferred', daemon=True)
+        self.thread.start()
+
+    def submit(self, check, values, violated):
+        '''Queue check(*values), calling violated(e) if it raises a violation.'''
+        try:
+            self.queue.put_nowait((check, values, violated))
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        while True:
+            check, values, violated = self.queue.get()
+            try:
+                try:
+                    check(*values)
+                except TypeDeclarationViolation as e:
+                    violated(e)
+            except Exception:
+                # the thread must outlive a check which goes wrong
+                self.errors += 1
+                logger.exception('pycheck: deferred check %r failed', check)
+            finally:
+                self.queue.task_done()
+
+
+_checker = None
+_checker_lock = threading.Lock()
+
+def get_checker():
+    '''Return the DeferredChecker, starting it if necessary.'''
+    global _checker
+    if _checker is None:
+        with _checker_lock:
+            if _checker is None:
+                _checker = DeferredChecker(settings.deferred_queue_size)
+    return _checker
+
+def join():
+    '''Wait until every deferred check queued so far has been made.'''
+    if _checker is not None:
+        _checker.queue.join()
+
+def dropped():
+    '''Return the number of deferred checks dropped because the queue was full.'''
+    return 0 if _checker is None else _checker.dropped
+
+def errors():
+    '''Return the number of deferred checks which failed with an exception other than
+    a violation.'''
+    return 0 if _checker is None else _checker.errors
+
+
+def _wanted(value):
+    # The caller only looked at the type of value; see looks_immutable().
+    return settings.deferred_mutable == INLINE or is_immutable(value)
+
+def _check_call(f, argspec, sample, positional, named):
+    for position, argname, argval in positional:
+        if _wanted(argval):
+            check_arg(f, position, argname, argval, argspec, sample)
+    for argname, argval in named:
+        if _wanted(argval):
+            check_kwd(f, argname, argval, argspec, sample)
+
+def _check_return(f, rvalue, argspec, sample):
+    if _wanted(rvalue):
+        check_return(f, rvalue, argspec, sample)
+
+def defer_args(f, args, kwds, argspec, sample, violated, inline_violated=None):
+    '''Queue the checks of the immutable arguments of a call. Mutable arguments are
+    checked here and now, or skipped, according to settings.deferred_mutable. If
+    inline_violated is given, it is called with each violation found here and now, and
+    the rest of the arguments are still checked.'''
+    inline = settings.deferred_mutable == INLINE
+    positional = []
+    for position, argname, argval in bind_args(args, argspec):
+        if argname not in argspec.annotations:
+            continue
+        if looks_immutable(argval):
+            positional.append((position, argname, argval))
+        elif inline:
+            try:
+                check_arg(f, position, argname, argval, argspec, sample)
+            except TypeDeclarationViolation as e:
+                if inline_violated is None:
+                    raise
+                inline_violated(e)
+    named = []
+    for argname, argval in kwds.items():
+        if argname not in argspec.annotations and argspec.varkw not in argspec.annotations:
+            continue
+        if looks_immutable(argval):
+            named.append((argname, argval))
+        elif inline:
+            try:
+                check_kwd(f, argname, argval, argspec, sample)
+            except TypeDeclarationViolation as e:
+                if inline_violated is None:
+                    raise
+                inline_violated(e)
+    if positional or named:
+        get_checker().submit(_check_call, (f, argspec, sample, positional, named), violated)
+
+def defer_return(f, rvalue, argspec, sample, violated):
+    '''Queue the check of a return value if it is immutable. Otherwise it is checked
+    here and now, or skipped, according to settings.deferred_mutable.'''
+    if 'return' not in argspec.annotations:
+        return
+    if looks_immutable(rvalue):
+        get_checker().submit(_check_return, (f, rvalue, argspec, sample), violated)
+    elif settings.deferred_mutable == INLINE:
+        check_return(f, rvalue, argspec, sample)
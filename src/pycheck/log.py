@@ -0,0 +1,208 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+A compact binary log of violations.
+
+Every violation reported through pycheck.report (see on_violation='log' and
+deferred checking) can also be appended to a ViolationLog. Each process writes a
+ring file of fixed-size records, ``violations.<pid>.ring``, through a memory map,
+so writing a record is a struct.pack_into() and never waits for the disk. The
+function, parameter and type names in the records are ids into an intern table
+which the process appends to ``violations.<pid>.names`` as new names turn up.
+When the ring is full the oldest records are overwritten.
+
+    import pycheck.log
+    pycheck.log.open_log('/var/tmp/pycheck')
+
+The log is read with ``python -m pycheck.log``:
+
+    python -m pycheck.log /var/tmp/pycheck                     # every record
+    python -m pycheck.log /var/tmp/pycheck --function parse    # just some functions
+    python -m pycheck.log /var/tmp/pycheck --by function       # counts per function
+    python -m pycheck.log /var/tmp/pycheck --by parameter      # counts per parameter
+    python -m pycheck.log /var/tmp/pycheck --by caller         # counts per call site
+
+(Call sites are only known with configure(callers=True).)
+'''
+import argparse
+import collections
+import glob
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from pycheck.checked_helpers import format_call_site, get_name, get_type_str, type_key
+
+MAGIC = b'PCVL'
+VERSION = 2
+# magic, version, record size, capacity, number of records ever written
+HEADER = struct.Struct('<4sHHIQ')
+HEADER_SIZE = 32
+# time, function id, position (0 if passed by keyword or the return value),
+# parameter name id, declared type id, actual type id, call site id
+RECORD = struct.Struct('<dIiIIII')
+# the call site id of a violation whose call site isn't known
+NO_ID = 0xFFFFFFFF
+
+ViolationRecord = collections.namedtuple('ViolationRecord',
+                                         'time pid function position argname declared actual caller')
+
+
+class ViolationLog:
+    '''Appends violations to this process's ring file in ``directory``.'''
+    def __init__(self, directory, capacity=65536):
+        self.directory = directory
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.pid = None
+        self._open()
+
+    def _open(self):
+        self.pid = os.getpid()
+        base = os.path.join(self.directory, 'violations.%d' % self.pid)
+        os.makedirs(self.directory, exist_ok=True)
+        size = HEADER_SIZE + self.capacity * RECORD.size
+        with open(base + '.ring', 'w+b') as ring:
+            ring.truncate(size)
+            self.map = mmap.mmap(ring.fileno(), size)
+        HEADER.pack_into(self.map, 0, MAGIC, VERSION, RECORD.size, self.capacity, 0)
+        self.count = 0
+        self.names = open(base + '.names', 'w', encoding='utf-8')
+        self.ids = {}
+
+    def _intern(self, key, name):
+        # called with the lock held. name is a function computing the name, so
+        # that it's only computed for keys not seen before.
+        try:
+            return self.ids[key]
+        except KeyError:
+            new_id = self.ids[key] = len(self.ids)
+            self.names.write('%d\t%s\n' % (new_id, name()))
+            self.names.flush()
+            return new_id
+
+    def write(self, violation):
+        '''Append a record of a TypeDeclarationViolation.'''
+        if not violation.details:
+            return
+        f, position, argname, _, declared_types, actual_types = violation.details[:6]
+        call_site = violation.call_site
+        now = time.time()
+        with self.lock:
+            if os.getpid() != self.pid:
+                # forked: don't write into the parent's ring
+                self._open()
+            record = (now,
+                      self._intern(('function', f), lambda: '%s.%s' % (f.__module__, get_name(f))),
+                      position or 0,
+                      self._intern(('parameter', argname), lambda: argname),
+                      self._intern(('type', type_key(declared_types)), lambda: get_type_str(declared_types)),
+                      self._intern(('type', type_key(actual_types)), lambda: get_type_str(actual_types)),
+                      NO_ID if call_site is None 
+                      else self._intern(('caller', call_site), lambda: format_call_site(call_site)))
+            RECORD.pack_into(self.map, HEADER_SIZE + (self.count % self.capacity) * RECORD.size, *record)
+            self.count += 1
+            struct.pack_into('<Q', self.map, 12, self.count)
+
+    def close(self):
+        with self.lock:
+            self.map.close()
+            self.names.close()
+
+
+def open_log(directory, capacity=65536):
+    '''Start logging reported violations to the ring files in directory. Returns
+    the ViolationLog.'''
+    from pycheck import report
+    log = ViolationLog(directory, capacity)
+    report.add_sink(log.write)
+    return log
+
+
+#===============================================================================
+# Reading
+#===============================================================================
+def read_names(path):
+    names = {}
+    with open(path, encoding='utf-8') as lines:
+        for line in lines:
+            name_id, _, name = line.rstrip('\n').partition('\t')
+            names[int(name_id)] = name
+    return names
+
+def read_ring(path):
+    '''Yield the ViolationRecords of one ring file, oldest first.'''
+    pid = int(os.path.basename(path).split('.')[1])
+    with open(path, 'rb') as ring:
+        data = ring.read()
+    magic, version, record_size, capacity, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError('%s is not a pycheck violation log' % path)
+    names = read_names(path[:-len('.ring')] + '.names')
+    for n in range(max(count - capacity, 0), count):
+        (when, function, position, argname, declared, actual, caller
+         ) = RECORD.unpack_from(data, HEADER_SIZE + (n % capacity) * RECORD.size)
+        yield ViolationRecord(when, pid, names.get(function, '?'), position or None,
+                              names.get(argname, '?'), names.get(declared, '?'), names.get(actual, '?'),
+                              None if caller == NO_ID else names.get(caller, '?'))
+
+def read_log(directory):
+    '''Return the ViolationRecords of every process which wrote to directory,
+    oldest first.'''
+    records = []
+    for path in glob.glob(os.path.join(directory, 'violations.*.ring')):
+        records.extend(read_ring(path))
+    # by time only: the other fields don't all compare (position may be None)
+    records.sort(key=lambda r: r.time)
+    return records
+
+
+def format_record(record):
+    return '%s %6d %s(): %s%s: declared=<%s>, actual=<%s>%s' % (
+        time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.time)), record.pid, record.function,
+        '' if record.position is None else 'parameter number %d, ' % record.position,
+        record.argname, record.declared, record.actual,
+        '' if record.caller is None else ', called from %s' % record.caller)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheck.log',
+                                     description='Read a pycheck binary violation log.')
+    parser.add_argument('directory', help='the directory given to pycheck.log.open_log()')
+    parser.add_argument('--function', help='only records of functions whose name contains this')
+    parser.add_argument('--parameter', help='only records of this parameter')
+    parser.add_argument('--since', type=float, metavar='SECONDS',
+                        help='only records from the last SECONDS seconds')
+    parser.add_argument('--by', choices=('function', 'parameter', 'caller'),
+                        help='print counts per function, per parameter or per call site '
+                             'instead of the records')
+    args = parser.parse_args(argv)
+
+    records = read_log(args.directory)
+    if args.function:
+        records = [r for r in records if args.function in r.function]
+    if args.parameter:
+        records = [r for r in records if r.argname == args.parameter]
+    if args.since is not None:
+        start = time.time() - args.since
+        records = [r for r in records if r.time >= start]
+
+    if args.by is None:
+        for record in records:
+            print(format_record(record))
+        return
+
+    if args.by == 'function':
+        counts = collections.Counter(r.function for r in records)
+    elif args.by == 'parameter':
+        counts = collections.Counter('%s(): %s' % (r.function, r.argname) for r in records)
+    else:
+        counts = collections.Counter('%s() called from %s' % (r.function, r.caller or '?') for r in records)
+    for name, count in counts.most_common():
+        print('%8d  %s' % (count, name))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Remembering which immutable collections have already passed their checks.
+
+Checking a collection declaration such as {tuple:int} looks at every element. When
+the same large tuple or frozenset is passed again and again -- a configuration
+table, say -- that scan gives the same answer every time, provided nothing in the
+collection can change. With configure(memo=True) a tuple or frozenset of at least
+settings.memo_min_length elements which passes a full check, and which is immutable
+all the way down (see is_immutable()), is remembered; later checks of the same object
+against the same declaration are skipped.
+
+Tuples and frozensets can't be weakly referenced, so the memo is keyed by id() and
+holds a reference to each collection it remembers, which guarantees that the id
+isn't reused while it is remembered. It holds at most settings.memo_size
+collections; the oldest is forgotten to make room for a new one.
+'''
+import threading
+from pycheck.config import settings
+
+ATOMIC_TYPES = frozenset((int, float, complex, bool, str, bytes, type(None), type(Ellipsis)))
+
+def is_immutable(value):
+    '''Return True if value, and everything it contains, is immutable.'''
+    value_type = type(value)
+    if value_type in ATOMIC_TYPES:
+        return True
+    if value_type is tuple or value_type is frozenset:
+        return all(is_immutable(v) for v in value)
+    params = getattr(value_type, '__dataclass_params__', None)
+    return params is not None and params.frozen
+
+def looks_immutable(value):
+    '''Return True if value is of an immutable type. Unlike is_immutable(), this
+    doesn't look inside tuples and frozensets, so it takes the same time whatever
+    their size.'''
+    value_type = type(value)
+    if value_type in ATOMIC_TYPES or value_type is tuple or value_type is frozenset:
+        return True
+    params = getattr(value_type, '__dataclass_params__', None)
+    return params is not None and params.frozen
+
+
+class VerdictMemo:
+    '''The collections which have been fully checked against a declaration, and
+    whether the verdict can be reused: True if the collection passed and is immutable,
+    False if it can't be remembered (it contains something mutable).'''
+
+    def __init__(self):
+        # (id(collection), id(declaration)) -> (collection, declaration, verdict)
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, collection, declaration):
+        '''Return the remembered verdict for collection, or None.'''
+        entry = self.entries.get((id(collection), id(declaration)))
+        if entry is None or entry[0] is not collection or entry[1] is not declaration:
+            return None
+        return entry[2]
+
+    def remember(self, collection, declaration, verdict):
+        with self.lock:
+            entries = self.entries
+            while entries and len(entries) >= settings.memo_size:
+                del entries[next(iter(entries))]
+            entries[(id(collection), id(declaration))] = (collection, declaration, verdict)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+verdicts = VerdictMemo()
@@ -0,0 +1,138 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Finding out which @checked functions checking is slowing down.
+
+While profiling (configure(profile=True)) @checked times the checks of every call,
+and of every annotated parameter separately, into the functions' stats (see
+pycheck.stats). The easiest way to profile a program is to run it with
+
+    python -m pycheck.profile [--top N] [--json FILE] [--collapsed FILE] [--callers N] script.py [args ...]
+
+which prints a table of the @checked functions ranked by the time spent checking
+them: the number of calls, the check time, the check time as a percentage of the
+time spent in the function, and the declaration that took longest to check. --json
+saves all of the figures; --collapsed saves them as collapsed stacks
+("function;parameter declaration microseconds" lines) for flame graph tools.
+--callers N samples the call sites of one call in N (see configure(callers=True)),
+and --json then includes the check time and violations of each call site.
+'''
+import argparse
+import json
+import os
+import runpy
+import sys
+from pycheck.checked_helpers import Iterable, Mapping, get_name
+from pycheck.stats import all_stats
+
+
+def describe(declaration):
+    '''Return the text of a declaration, as it would be written in an annotation.'''
+    if declaration is None:
+        return 'None'
+    if isinstance(declaration, Mapping):
+        return '{%s}' % ', '.join('%s:%s' % (describe(k), describe(v)) for k, v in declaration.items())
+    if isinstance(declaration, type) or callable(declaration):
+        return get_name(declaration)
+    if isinstance(declaration, Iterable) and not isinstance(declaration, str):
+        return '(%s)' % ', '.join(describe(d) for d in declaration)
+    return repr(declaration)
+
+def costliest_declaration(stats):
+    '''Return (parameter, declaration text, seconds) for the parameter of a function
+    which took the longest to check, or None.'''
+    if not stats.declaration_time:
+        return None
+    name = max(stats.declaration_time, key=stats.declaration_time.get)
+    return (name, describe(stats.annotations.get(name)), stats.declaration_time[name])
+
+def ranked():
+    '''Return the FunctionStats of the functions which have been timed, the most time
+    spent checking first.'''
+    return sorted((s for s in all_stats() if s.calls), key=lambda s: s.check_time, reverse=True)
+
+def report_table(stats_list, out=None):
+    out = out or sys.stdout
+    out.write('%10s %12s %7s  %-40s %s\n' % ('calls', 'check ms', 'check%', 'function', 'costliest declaration'))
+    for stats in stats_list:
+        costliest = costliest_declaration(stats)
+        out.write('%10d %12.3f %6.1f%%  %-40s %s\n' % (
+            stats.calls, stats.check_time * 1e3,
+            100.0 * stats.check_time / stats.total_time if stats.total_time else 0.0,
+            stats.qualified_name,
+            '' if costliest is None else '%s:%s (%.3f ms)' % (costliest[0], costliest[1], costliest[2] * 1e3)))
+
+def as_json(stats_list):
+    return [dict(function=s.qualified_name, calls=s.calls, check_time=s.check_time,
+                 total_time=s.total_time, violations=s.violations, downgrades=s.downgrades,
+                 declarations=[dict(parameter=name, declaration=describe(s.annotations.get(name)),
+                                    check_time=seconds)
+                               for name, seconds in sorted(s.declaration_time.items(),
+                                                           key=lambda item: -item[1])],
+                 callers=[dict(call_site=site.name, calls=site.calls, check_time=site.check_time,
+                               violations=site.violations)
+                          for site in sorted(s.call_sites.values(),
+                                             key=lambda site: (-site.check_time, -site.violations))])
+            for s in stats_list]
+
+def collapsed_stacks(stats_list):
+    lines = []
+    for s in stats_list:
+        for name, seconds in s.declaration_time.items():
+            lines.append('%s;%s %s %d' % (s.qualified_name, name, describe(s.annotations.get(name)),
+                                          round(seconds * 1e6)))
+        body = s.total_time - s.check_time
+        if body > 0:
+            lines.append('%s %d' % (s.qualified_name, round(body * 1e6)))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheck.profile',
+                                     description='Run a program and rank its @checked functions by check cost.')
+    parser.add_argument('--top', type=int, default=20, help='number of functions to list (default 20)')
+    parser.add_argument('--json', metavar='FILE', help='also write the figures as JSON to FILE')
+    parser.add_argument('--collapsed', metavar='FILE', help='also write collapsed stacks to FILE')
+    parser.add_argument('--callers', type=int, metavar='N', 
+                        help='attribute violations and one call in N to their call sites')
+    parser.add_argument('script')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    options = parser.parse_args(argv)
+
+    if not __debug__:
+        sys.stderr.write('pycheck.profile: @checked does nothing when python is run with -O\n')
+
+    from pycheck import configure
+    configure(profile=True)
+    if options.callers:
+        configure(callers=True, callers_sample_rate=options.callers)
+    argv, path = sys.argv, sys.path[:]
+    sys.argv = [options.script] + options.args
+    sys.path.insert(0, os.path.dirname(options.script) or '.')
+    status = 0
+    try:
+        runpy.run_path(options.script, run_name='__main__')
+    except SystemExit as e:
+        status = e.code
+    finally:
+        sys.argv = argv
+        sys.path[:] = path
+        configure(profile=False)
+        if options.callers:
+            configure(callers=False)
+        stats_list = ranked()
+        sys.stdout.flush()
+        sys.stderr.write('\n')
+        report_table(stats_list[:options.top], sys.stderr)
+        if options.json:
+            with open(options.json, 'w') as out:
+                json.dump(as_json(stats_list), out, indent=1)
+        if options.collapsed:
+            with open(options.collapsed, 'w') as out:
+                out.write('\n'.join(collapsed_stacks(stats_list)) + '\n')
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Structural ("duck type") declarations. See protocol().
+'''
+import inspect
+from pycheck.checked_helpers import Mapping
+from pycheck.typecache import TypeCache
+
+try:
+    import typing
+except ImportError:
+    typing = None
+
+
+class ProtocolMeta(type):
+    '''Metaclass of the classes returned by protocol(). isinstance() and issubclass()
+    check that the type has the protocol's members, and remember the verdict for
+    the type.'''
+
+    def __instancecheck__(cls, instance):
+        value_type = type(instance)
+        try:
+            return cls.verdicts.data[id(value_type)]
+        except KeyError:
+            return cls._judge(value_type)
+
+    def __subclasscheck__(cls, subclass):
+        try:
+            return cls.verdicts.data[id(subclass)]
+        except KeyError:
+            return cls._judge(subclass)
+
+    def _judge(cls, value_type):
+        verdict = cls.verdicts[value_type] = all(hasattr(value_type, name) for name in cls.members)
+        return verdict
+
+
+def protocol(*members, name=None):
+    '''Return a type declaration matching any value whose type has all of the given
+    attributes (methods, properties, class attributes, ...):
+
+        @checked
+        def copy(src:protocol('read', 'close'), dst:protocol('write')):
+            ...
+
+    Whether a type has the members is worked out the first time a value of that type
+    is checked and remembered, so checking another value of the same type costs a
+    single dict lookup. Since it's the type which is checked, attributes which are
+    only set on instances (e.g. in __init__) can't be protocol members.
+
+    A subclass of typing.Protocol may also be used as a declaration; its methods and
+    its attributes, annotated (size: int) or with values, are its members. Like any
+    other member, an annotated one has to be found on the type: a class attribute,
+    property or slot, say.
+    '''
+    name = name or 'protocol(%s)' % ', '.join(members)
+    cls = ProtocolMeta(name, (), dict(members=frozenset(members), verdicts=TypeCache()))
+    cls.__qualname__ = name
+    return cls
+
+
+#===============================================================================
+# typing.Protocol
+#===============================================================================
+# attributes every protocol class has, which aren't members of the protocol
+_NOT_MEMBERS = frozenset([
+    '__abstractmethods__', '__annotations__', '__dict__', '__doc__', '__init__', '__module__',
+    '__new__', '__slots__', '__subclasshook__', '__weakref__', '__class_getitem__',
+    '__parameters__', '__orig_bases__', '__orig_class__', '__qualname__', '__protocol_attrs__',
+    '__non_callable_proto_members__', '__type_params__', '__firstlineno__', '__static_attributes__',
+    '__callable_proto_members_only__', '__init_subclass__', '__annotate__', '_is_protocol',
+    '_is_runtime_protocol'])
+
+def is_typing_protocol(declaration):
+    return (isinstance(declaration, type) and getattr(declaration, '_is_protocol', False)
+            and declaration is not typing.Protocol)
+
+def _own_annotations(cls):
+    get_annotations = getattr(inspect, 'get_annotations', None)
+    if get_annotations is None:
+        return vars(cls).get('__annotations__', {})
+    # evaluated lazily from python 3.14
+    return get_annotations(cls)
+
+def protocol_members(protocol_class):
+    '''Return the names of the members of a typing.Protocol subclass.'''
+    members = set()
+    for base in protocol_class.__mro__:
+        if base in (object, typing.Protocol, typing.Generic):
+            continue
+        members.update(name for name in vars(base)
+                       if name not in _NOT_MEMBERS and not name.startswith('_abc_'))
+        # data members which are only annotated
+        members.update(_own_annotations(base))
+    return members
+
+_from_typing = {}
+
+def from_typing(protocol_class):
+    '''Return the protocol() declaration equivalent to a typing.Protocol subclass.'''
+    try:
+        return _from_typing[protocol_class]
+    except KeyError:
+        return _from_typing.setdefault(protocol_class,
+                                       protocol(*sorted(protocol_members(protocol_class)),
+                                                name=protocol_class.__qualname__))
+
+def replace_protocols(declaration):
+    '''Return declaration with any typing.Protocol subclasses in it replaced by the
+    equivalent protocol() declarations. Returns declaration itself if there are none.'''
+    if typing is None or isinstance(declaration, str):
+        return declaration
+    if is_typing_protocol(declaration):
+        return from_typing(declaration)
+    if isinstance(declaration, Mapping):
+        replaced = dict((replace_protocols(k), replace_protocols(v)) for k, v in declaration.items())
+        return declaration if replaced == declaration else replaced
+    if isinstance(declaration, (tuple, list, set, frozenset)):
+        # only the containers declarations are written with; typing.List[int] and
+        # the like are left alone
+        replaced = tuple(replace_protocols(d) for d in declaration)
+        return declaration if replaced == tuple(declaration) else replaced
+    return declaration
+
+def patch_annotations(annotations):
+    '''Replace the typing.Protocol subclasses in a function's annotations.'''
+    for name, declaration in list(annotations.items()):
+        replaced = replace_protocols(declaration)
+        if replaced is not declaration:
+            annotations[name] = replaced
@@ -14,9 +14,120 @@ Created on Jan 8, 2013
 #
 #            return eval('%s%s(*%s, **%s)' % ('mod.' if module else '', classname, args, kwds))  
 #    return ClassProxy  
-import inspect
+import builtins
 import importlib
+import sys
+import threading
+from pycheck.checked_helpers import Mapping, prepare_annotations
+from pycheck.protocols import replace_protocols
 
+#===============================================================================
+# forward references
+#===============================================================================
+_resolved = {}
+_pending = set()
+_lock = threading.Lock()
+
+def resolve_name(name, module=None):
+    """Return the object named by a forward reference. name is either qualified,
+    "package.module:Name", or just "Name", which is looked up in module. Name may
+    be dotted ("module:Outer.Inner"). An unqualified name which module doesn't
+    define is looked up in builtins, so "int" means int. Each reference is only
+    looked up once."""
+    modulename, _, attrs = name.rpartition(':')
+    key = (modulename or module, attrs)
+    try:
+        return _resolved[key]
+    except KeyError:
+        pass
+    if key[0] is None:
+        raise NameError("forward reference %r is not qualified with a module" % name)
+    obj = importlib.import_module(key[0])
+    if not modulename and not hasattr(obj, attrs.partition('.')[0]):
+        obj = builtins
+    for attr in attrs.split('.'):
+        try:
+            obj = getattr(obj, attr)
+        except AttributeError:
+            raise NameError("cannot resolve forward reference %r: %r has no attribute %r" 
+                            % (name, obj, attr)) from None
+    _resolved[key] = obj
+    return obj
+
+# The containers which hold declarations, (int, str) say. Other iterables, such as
+# typing.List[int], are never taken apart.
+DECLARATION_SEQUENCES = (tuple, list, set, frozenset)
+
+def has_forward_refs(declaration):
+    if isinstance(declaration, str):
+        return True
+    if isinstance(declaration, Mapping):
+        return any(has_forward_refs(k) or has_forward_refs(v) for k, v in declaration.items())
+    if isinstance(declaration, DECLARATION_SEQUENCES):
+        return any(has_forward_refs(d) for d in declaration)
+    return False
+
+def resolve_declaration(declaration, module):
+    """Return declaration with the forward references in it replaced by what they refer to."""
+    if isinstance(declaration, str):
+        return replace_protocols(resolve_name(declaration, module))
+    if isinstance(declaration, Mapping):
+        return dict((resolve_declaration(k, module), resolve_declaration(v, module)) 
+                    for k, v in declaration.items())
+    if isinstance(declaration, DECLARATION_SEQUENCES):
+        return tuple(resolve_declaration(d, module) for d in declaration)
+    return declaration
+
+
+class ForwardRefs:
+    """The forward references in the annotations of one @checked function. 
+    
+    A forward reference is a string annotation naming a type which may not exist yet
+    when the function is defined, typically because of circular imports:
+    
+        @checked
+        def to_b(self) -> "other.module:B":
+            ...
+    
+    Unqualified names ("B") are looked up in the function's own module. The references 
+    are resolved by the first call of the function, or by resolve_all(), and the 
+    annotations are then patched with the types they refer to, so that checking them 
+    is no slower than checking any other annotation.
+    """
+    def __init__(self, annotations, module):
+        self.annotations = annotations
+        self.module = module
+        self.resolved = False
+        with _lock:
+            _pending.add(self)
+
+    def resolve(self):
+        for name, declaration in list(self.annotations.items()):
+            if has_forward_refs(declaration):
+                self.annotations[name] = resolve_declaration(declaration, self.module)
+        prepare_annotations(self.annotations)
+        self.resolved = True
+        with _lock:
+            _pending.discard(self)
+
+def forward_refs(annotations, module):
+    """Return the ForwardRefs of a function's annotations, or None if it has none."""
+    if any(has_forward_refs(d) for d in annotations.values()):
+        return ForwardRefs(annotations, module)
+    return None
+
+def resolve_all():
+    """Resolve the forward references of every @checked function defined so far 
+    which hasn't resolved them yet. Raises NameError (or ImportError) for the first 
+    reference which can't be resolved."""
+    with _lock:
+        pending = list(_pending)
+    for refs in pending:
+        refs.resolve()
+
+#===============================================================================
+# type_proxy
+#===============================================================================
 def type_proxy(typename):
     """type_proxy(typename) is used when an actual typename cannot be used because 
     it is not yet defined in the namespace and cannot be. 
@@ -60,60 +171,35 @@ def type_proxy(typename):
                     
             class B:
                 ...unchanged...
+                
+    Forward references may also be given as strings naming the type, "B" or, for 
+    a type in another module, "other.module:B" -- see ForwardRefs. Those are resolved
+    once and then cost no more to check than the type itself.
     """
     
+    # The module type_proxy() was called from, where typename will be looked up.
+    modulename = sys._getframe(1).f_globals['__name__']
+    
     class MetaProxy(type):
-        
-        stack = inspect.stack()
-        def __init__(self, *args, **kwds):
-            super().__init__(*args, **kwds)
-            
-            
-            # stack[0] is right here where inspect.stack() was called.
-            # stack[1] is where the function type_proxy() calls the constructor of this class.
-            # stack[2] is where in the code type_proxy() was actually called.
-            f_globals = self.stack[2][0].f_globals
-            self.__modulename = f_globals['__name__']
                 
         def __subclasscheck__(self, subclass):
             """
             Return true if subclass should be considered a (direct or indirect) subclass of class. 
             If defined, called to implement issubclass(subclass, class).
             """
-            
-    
-            module = importlib.import_module(self.__modulename)
-            
-            the_type = getattr(module, typename)
-            return issubclass(the_type, subclass)
+            return issubclass(resolve_name(typename, modulename), subclass)
 
         def __instancecheck__(self, instance):
             """
             Return true if instance should be considered a (direct or indirect) instance of class. 
             If defined, called to implement isinstance(instance, class).
             """
-            module = importlib.import_module(self.__modulename)
-            
-            the_type = getattr(module, typename)
-            return isinstance(instance, the_type)  
+            return isinstance(instance, resolve_name(typename, modulename))
     
     class Proxy(metaclass=MetaProxy):
-        stack = inspect.stack()
 
         def __new__(cls, *args, **kwds):
-            
-            
-            # stack[0] is right here where inspect.stack() was called.
-            # stack[1] is where 
-            # stack[2] is where 
-            f_globals = cls.stack[2][0].f_globals
-            
-            modulename = f_globals['__name__']
-    
-            module = importlib.import_module(modulename)
-            
-            the_type = getattr(module, typename)
-            return the_type(*args, **kwds)
+            return resolve_name(typename, modulename)(*args, **kwds)
         
     return Proxy
     
@@ -0,0 +1,237 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+A pytest plugin which turns on checking for chosen packages for the length of a test
+session, without editing them: every annotated function of a chosen package (and the
+methods of its classes) is wrapped with @checked as the package is imported.
+
+    pytest -p pycheck.pytest_plugin --pycheck=mypackage [--pycheck=other] [--pycheck-top=N]
+
+or, to always use it, add pytest_plugins = ['pycheck.pytest_plugin'] to a conftest.py
+and name the packages in the pytest configuration:
+
+    [pytest]
+    pycheck_packages = mypackage other
+
+A TypeDeclarationViolation fails the test which caused it, with pycheck's own frames
+left out of the traceback. Violations which are reported rather than raised
+(on_violation='log', or deferred checks) fail the test too. Checking is profiled (see
+pycheck.profile), and at the end of the session the functions and the tests which
+spent the most time checking are listed.
+
+Functions which other modules imported before the session started, e.g.
+"from mypackage import f" in a conftest.py, keep the unchecked version. Functions
+with annotations which aren't pycheck declarations -- typing generics such as
+List[int] or list[int], strings which aren't forward references pycheck can resolve
+('Optional[Node]'), or the strings "from __future__ import annotations" turns every
+annotation into -- are left alone.
+'''
+import __future__
+import importlib.abc
+import io
+import re
+import sys
+import types
+from time import perf_counter
+import pytest
+from pycheck import checked, configure
+from pycheck import deferred, report
+from pycheck.checked_helpers import Mapping, TypeDeclarationViolation, is_predicate
+from pycheck.config import settings
+from pycheck.profile import ranked, report_table
+from pycheck.proxy import resolve_name
+from pycheck.stats import total_check_time
+from pycheck.trace import decorate_module
+
+
+# a forward reference: "Name", "Outer.Inner" or "package.module:Name"
+_FORWARD_REF = re.compile(r'^(?:[A-Za-z_][\w.]*:)?[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*$')
+
+def is_declaration(annotation, module=None):
+    '''Return True if annotation is something @checked can check. A string has to be
+    a forward reference, as pycheck writes them, to something which can be checked;
+    module is the name of the module unqualified ones are looked up in.'''
+    if annotation is None:
+        return True
+    if isinstance(annotation, str):
+        # 'Optional[Node]' and the like are typing's forward references
+        if not _FORWARD_REF.match(annotation):
+            return False
+        try:
+            return is_declaration(resolve_name(annotation, module))
+        except Exception:
+            return False
+    if (isinstance(annotation, getattr(types, 'GenericAlias', ()))
+        or getattr(annotation, '__module__', None) == 'typing'):
+        return False
+    if isinstance(annotation, type):
+        return True
+    if isinstance(annotation, Mapping):
+        return all(is_declaration(k, module) and is_declaration(v, module)
+                   for k, v in annotation.items())
+    if isinstance(annotation, (tuple, list, set, frozenset)):
+        return all(is_declaration(d, module) for d in annotation)
+    return is_predicate(annotation)
+
+def is_checkable(f):
+    '''Return True if f has annotations, and they are all pycheck declarations.'''
+    annotations = getattr(f, '__annotations__', None)
+    if not annotations:
+        return False
+    if f.__code__.co_flags & __future__.annotations.compiler_flag:
+        # the annotations are strings of typing declarations, not forward references
+        return False
+    return all(is_declaration(a, f.__module__) for a in annotations.values())
+
+def checked_if_possible(f):
+    '''Return checked(f), or f itself if @checked can't make sense of its annotations.'''
+    try:
+        return checked(f)
+    except (TypeError, NameError, ImportError):
+        return f
+
+def check_module(module):
+    '''Wrap every function of module which is_checkable() with @checked.'''
+    decorate_module(module, checked_if_possible, wanted=is_checkable)
+
+
+class CheckingLoader(importlib.abc.Loader):
+    '''Wraps the loader of a module of a chosen package, to check the module once it
+    has been executed.'''
+    def __init__(self, loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.loader.exec_module(module)
+        check_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class CheckingFinder(importlib.abc.MetaPathFinder):
+    '''Finds the modules of the chosen packages through the rest of sys.meta_path, and
+    gives them a CheckingLoader.'''
+    def __init__(self, packages):
+        self.packages = tuple(packages)
+
+    def chosen(self, name):
+        return any(name == package or name.startswith(package + '.') for package in self.packages)
+
+    def find_spec(self, name, path, target=None):
+        if not self.chosen(name):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = CheckingLoader(spec.loader)
+                return spec
+        return None
+
+
+def _hide_violation_frames(excinfo):
+    return excinfo.errisinstance(TypeDeclarationViolation)
+
+def _pycheck_modules():
+    return [module for name, module in list(sys.modules.items())
+            if (name == 'pycheck' or name.startswith('pycheck.')) and not name.startswith('pycheck.test')
+            and module is not None]
+
+
+class CheckSession:
+    '''The plugin's state for one test session.'''
+
+    def __init__(self, config, packages):
+        self.config = config
+        self.top = config.getoption('pycheck_top')
+        self.finder = CheckingFinder(packages)
+        self.reported = []
+        # (check seconds, test seconds, node id) for each test
+        self.tests = []
+
+    def start(self):
+        self.profiling = settings.profile
+        configure(profile=True)
+        report.add_sink(self.reported.append)
+        # pytest leaves out the frames of modules with a true __tracebackhide__
+        for module in _pycheck_modules():
+            module.__tracebackhide__ = _hide_violation_frames
+        sys.meta_path.insert(0, self.finder)
+        for name, module in list(sys.modules.items()):
+            if self.finder.chosen(name) and module is not None:
+                check_module(module)
+
+    def stop(self):
+        sys.meta_path.remove(self.finder)
+        report.remove_sink(self.reported.append)
+        for module in _pycheck_modules():
+            vars(module).pop('__tracebackhide__', None)
+        configure(profile=self.profiling)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        del self.reported[:]
+        checking = total_check_time()
+        start = perf_counter()
+        yield
+        deferred.join()
+        self.tests.append((total_check_time() - checking, perf_counter() - start, item.nodeid))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        test_report = outcome.get_result()
+        if call.when == 'call' and self.reported:
+            violations = [str(v) for v in self.reported]
+            del self.reported[:]
+            if test_report.passed:
+                test_report.outcome = 'failed'
+                test_report.longrepr = '\n'.join(['pycheck reported %d violation(s):' % len(violations)]
+                                                 + violations)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        write = terminalreporter.write_line
+        terminalreporter.write_sep('-', 'pycheck check overhead')
+        table = io.StringIO()
+        report_table(ranked()[:self.top], table)
+        for line in table.getvalue().splitlines():
+            write(line)
+        write('')
+        write('%12s %7s  %s' % ('check ms', 'check%', 'test'))
+        for check_time, test_time, nodeid in sorted(self.tests, reverse=True)[:self.top]:
+            write('%12.3f %6.1f%%  %s' % (check_time * 1e3,
+                                          100.0 * check_time / test_time if test_time else 0.0, nodeid))
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('pycheck')
+    group.addoption('--pycheck', action='append', dest='pycheck_packages', default=[],
+                    metavar='PACKAGE', help='check the annotated functions of PACKAGE during the session')
+    group.addoption('--pycheck-top', type=int, dest='pycheck_top', default=10, metavar='N',
+                    help='number of functions and tests to list in the check overhead summary (default 10)')
+    parser.addini('pycheck_packages', 'packages whose annotated functions are checked', type='args')
+
+def pytest_configure(config):
+    packages = config.getoption('pycheck_packages') or config.getini('pycheck_packages')
+    if not packages:
+        return
+    if not __debug__:
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning('pycheck: @checked does nothing when python is run with -O'), 2)
+    session = CheckSession(config, packages)
+    session.start()
+    config.pluginmanager.register(session, 'pycheck-session')
+
+def pytest_unconfigure(config):
+    session = config.pluginmanager.get_plugin('pycheck-session')
+    if session is not None:
+        session.stop()
+        config.pluginmanager.unregister(session)
@@ -0,0 +1,139 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Deduplicated, rate-limited reporting of violations for @checked functions which
+don't raise (see configure(on_violation='log')).
+
+Violations are grouped by their signature -- the function, parameter, declared
+type and actual type, and the call site when callers are attributed (see
+configure(callers=True)), so that each offending caller is reported. The first
+violation with a given signature is logged in full; repeats are only counted, and a
+summary with the count is logged at most once every settings.summary_interval
+seconds. Every message logged, full or summary, has to get past a token-bucket rate
+limit: the global one (settings.report_rate and settings.report_burst) and, if the
+function has one, the function's own (@checked(report_rate=...)). Counts held back
+when the program exits are logged by flush().
+
+Reports are logged as warnings to the 'pycheck' logger. Every violation, repeated
+or not, is also passed to the sinks added with add_sink() -- see pycheck.log for a
+sink which keeps a compact binary record of them.
+'''
+import atexit
+import logging
+import threading
+from time import monotonic
+from pycheck.config import settings
+
+logger = logging.getLogger('pycheck')
+
+
+class TokenBucket:
+    '''Allows ``rate`` events per second on average, and up to ``burst`` at once.'''
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = monotonic()
+
+    def take(self, now):
+        '''Take a token if one is available. Returns True if one was.'''
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class _Record:
+    __slots__ = ('message', 'reported', 'count', 'pending', 'last_report')
+
+    def __init__(self, message):
+        # The text of the first violation. The violation itself isn't kept: it holds
+        # the offending value, which may be large.
+        self.message = message
+        self.reported = False  # whether the first violation has been logged
+        self.count = 0       # all occurrences
+        self.pending = 0     # occurrences not reported yet
+        self.last_report = 0.0
+
+
+_records = {}
+_lock = threading.Lock()
+_global_bucket = None
+_sinks = []
+
+def add_sink(sink):
+    '''Call sink(violation) for every violation reported from now on.'''
+    _sinks.append(sink)
+
+def remove_sink(sink):
+    _sinks.remove(sink)
+
+def _allowed(now, bucket):
+    global _global_bucket
+    if (_global_bucket is None or _global_bucket.rate != settings.report_rate
+        or _global_bucket.burst != settings.report_burst):
+        _global_bucket = TokenBucket(settings.report_rate, settings.report_burst)
+    return (bucket is None or bucket.take(now)) and _global_bucket.take(now)
+
+def _summary(record):
+    return '%s [repeated %d more times, %d in total]' % (record.message, record.pending, record.count)
+
+
+def report(violation, bucket=None):
+    '''Report a TypeDeclarationViolation. bucket is the reporting function's own
+    TokenBucket, if it has one.'''
+    for sink in _sinks:
+        sink(violation)
+    signature = violation.signature
+    if signature is None:
+        signature = str(violation)
+    now = monotonic()
+    record = _records.get(signature)
+    if record is None:
+        # formatted once per signature, outside the lock
+        first = _Record(str(violation))
+    with _lock:
+        if record is None:
+            record = _records.setdefault(signature, first)
+        record.count += 1
+        record.pending += 1
+        if not record.reported:
+            if not _allowed(now, bucket):
+                return
+            record.reported = True
+            message = record.message
+            if record.pending > 1:
+                message += ' [%d earlier occurrences not reported]' % (record.pending - 1)
+        else:
+            if now - record.last_report < settings.summary_interval or not _allowed(now, bucket):
+                return
+            message = _summary(record)
+        record.pending = 0
+        record.last_report = now
+    logger.warning(message)
+
+
+def flush():
+    '''Log a summary of every violation with occurrences which haven't been
+    reported yet, regardless of the rate limits.'''
+    with _lock:
+        messages = [_summary(r) for r in _records.values() if r.pending and r.reported]
+        messages.extend('%s [%d occurrences not reported]' % (r.message, r.pending)
+                        for r in _records.values() if r.pending and not r.reported)
+        for record in _records.values():
+            record.pending = 0
+    for message in messages:
+        logger.warning(message)
+
+def reset():
+    '''Forget every violation reported so far, and refill the global rate limit.'''
+    global _global_bucket
+    with _lock:
+        _records.clear()
+        _global_bucket = None
+
+atexit.register(flush)
@@ -0,0 +1,168 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Per-function counters collected by @checked. Stats are keyed by the original
+(undecorated) function, but get_stats() will accept either the function or the
+checked wrapper around it. They are only kept as long as the function is.
+
+profile_args() and profile_return() are the checks @checked makes while profiling,
+which time each declaration; pycheck.profile reports the results.
+'''
+import weakref
+from time import perf_counter
+from pycheck.checked_helpers import (TypeDeclarationViolation, bind_args, check_arg, check_kwd,
+                                     check_return, format_call_site, get_name)
+
+
+class FunctionStats:
+    '''Counters accumulated for a single @checked function.
+
+    downgrades  -- number of times the function went over its check budget and
+                   was switched to degraded (shallow or sampled) checking.
+    last_overrun_us -- check time, in microseconds, of the call that most
+                   recently triggered a downgrade.
+    violations  -- number of violations detected, whether raised or reported.
+
+    These are only collected while profiling (see configure(profile=True) and
+    pycheck.profile):
+
+    calls       -- number of calls.
+    check_time  -- seconds spent checking the calls.
+    total_time  -- seconds spent in the calls, checks included.
+    declaration_time -- seconds spent checking each annotated parameter (and
+                   'return').
+
+    With configure(callers=True), call_sites holds a CallSite for each call site
+    which has caused a violation or been sampled (settings.callers_sample_rate).
+    '''
+    def __init__(self, f):
+        self.name = get_name(f)
+        self.module = f.__module__
+        # the annotations actually checked, set by @checked
+        self.annotations = {}
+        self.reset()
+
+    def reset(self):
+        self.downgrades = 0
+        self.last_overrun_us = None
+        self.violations = 0
+        self.calls = 0
+        self.check_time = 0.0
+        self.total_time = 0.0
+        self.declaration_time = {}
+        # (code object, line number) -> CallSite
+        self.call_sites = {}
+        self.caller_countdown = 1
+
+    def account(self, check_time, total_time):
+        self.calls += 1
+        self.check_time += check_time
+        self.total_time += total_time
+
+    def call_site(self, code, lineno):
+        '''Return the CallSite for the call at line lineno of code, creating it if
+        necessary.'''
+        key = (code, lineno)
+        try:
+            return self.call_sites[key]
+        except KeyError:
+            return self.call_sites.setdefault(key, CallSite(key))
+
+    @property
+    def qualified_name(self):
+        return '%s.%s' % (self.module, self.name)
+
+    def __repr__(self):
+        return '<FunctionStats %s: downgrades=%d, violations=%d>' % (self.name, self.downgrades,
+                                                                     self.violations)
+
+
+class CallSite:
+    '''Counters for the calls of a function made from one place.
+
+    calls       -- number of sampled calls.
+    check_time  -- seconds spent checking the sampled calls, while profiling.
+    violations  -- number of violations caused, whether raised or reported.
+    '''
+    __slots__ = ('key', 'calls', 'check_time', 'violations')
+
+    def __init__(self, key):
+        # (code object, line number)
+        self.key = key
+        self.calls = 0
+        self.check_time = 0.0
+        self.violations = 0
+
+    @property
+    def name(self):
+        return format_call_site(self.key)
+
+    def __repr__(self):
+        return '<CallSite %s: calls=%d, violations=%d>' % (self.name, self.calls, self.violations)
+
+
+_stats = weakref.WeakKeyDictionary()
+
+def get_stats(f):
+    '''Return the FunctionStats for f, creating it if necessary.'''
+    f = getattr(f, '__wrapped__', f)
+    try:
+        return _stats[f]
+    except KeyError:
+        return _stats.setdefault(f, FunctionStats(f))
+
+def all_stats():
+    '''Return the FunctionStats of every function which has recorded any.'''
+    return list(_stats.values())
+
+def downgraded():
+    '''Return the FunctionStats of the functions which have hit their check budget,
+    most frequently downgraded first.'''
+    return sorted((s for s in list(_stats.values()) if s.downgrades),
+                  key=lambda s: s.downgrades, reverse=True)
+
+def reset_stats():
+    '''Zero all of the counters collected so far.'''
+    for stats in list(_stats.values()):
+        stats.reset()
+
+def total_check_time():
+    '''Return the seconds spent checking all of the functions while profiling.'''
+    return sum(s.check_time for s in list(_stats.values()))
+
+
+def _timed(times, name, check, *args):
+    start = perf_counter()
+    try:
+        check(*args)
+    finally:
+        times[name] = times.get(name, 0.0) + (perf_counter() - start)
+
+def profile_args(f, args, kwds, argspec, sample, stats, violated=None):
+    '''check_args() and check_kwds(), timing each annotated parameter.'''
+    times = stats.declaration_time
+    annotations = argspec.annotations
+    for position, argname, argval in bind_args(args, argspec):
+        if argname in annotations:
+            try:
+                _timed(times, argname, check_arg, f, position, argname, argval, argspec, sample)
+            except TypeDeclarationViolation as e:
+                if violated is None:
+                    raise
+                violated(e)
+    for argname, argval in kwds.items():
+        name = argname if argname in annotations else argspec.varkw
+        if name in annotations:
+            try:
+                _timed(times, name, check_kwd, f, argname, argval, argspec, sample)
+            except TypeDeclarationViolation as e:
+                if violated is None:
+                    raise
+                violated(e)
+
+def profile_return(f, rvalue, argspec, sample, stats):
+    '''check_return(), timed.'''
+    if 'return' in argspec.annotations:
+        _timed(stats.declaration_time, 'return', check_return, f, rvalue, argspec, sample)
@@ -0,0 +1,106 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import gc
+import unittest
+import weakref
+from pycheck import checked, TypeDeclarationViolation
+from pycheck.checked_helpers import sample_items
+from pycheck.stats import all_stats, get_stats, downgraded
+
+
+class TestSampleItems(unittest.TestCase):
+
+    def test_shallow(self):
+        self.assertEqual(sample_items([1, 2, 3], 0), ())
+
+    def test_short_sequence_is_checked_whole(self):
+        self.assertEqual(sample_items([1, 2, 3], 5), [1, 2, 3])
+
+    def test_sequence_sampled_evenly(self):
+        self.assertEqual(sample_items(list(range(100)), 4), (0, 25, 50, 75))
+
+    def test_unordered_collection(self):
+        self.assertEqual(len(sample_items(set(range(100)), 4)), 4)
+
+
+@unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+class TestBudget(unittest.TestCase):
+
+    def test_within_budget(self):
+        @checked(budget_us=10**9)
+        def f(x:{list:int}) -> {list:int}:
+            return x
+
+        self.assertEqual(f([1, 2]), [1, 2])
+        self.assertRaises(TypeDeclarationViolation, lambda: f([1, 2.0]))
+        self.assertEqual(get_stats(f).downgrades, 0)
+
+    def test_shallow_after_overrun(self):
+        @checked(budget_us=0, cooldown=60)
+        def f(x:{list:int}):
+            pass
+
+        f(list(range(1000)))
+        self.assertEqual(get_stats(f).downgrades, 1)
+        self.assertIn(get_stats(f), downgraded())
+
+        # element types aren't checked while cooling down...
+        f([1, 2.0])
+        # ...but the collection type still is.
+        self.assertRaises(TypeDeclarationViolation, lambda: f((1, 2)))
+        self.assertEqual(get_stats(f).downgrades, 1)
+
+    def test_sampled_after_overrun(self):
+        @checked(budget_us=0, cooldown=60, degrade='sample', sample_size=2)
+        def f(x:{list:int}):
+            pass
+
+        f(list(range(1000)))
+        f([1, 2.0, 3, 4])
+        self.assertRaises(TypeDeclarationViolation, lambda: f([1.0, 2, 3, 4]))
+
+    def test_cooldown_expires(self):
+        @checked(budget_us=0, cooldown=0)
+        def f(x:{list:int}):
+            pass
+
+        f([1])
+        f([1])
+        self.assertEqual(get_stats(f).downgrades, 2)
+        self.assertRaises(TypeDeclarationViolation, lambda: f([1.0]))
+
+    def test_deferred_checks_are_charged(self):
+        @checked(budget_us=0, cooldown=60, deferred=True)
+        def f(x:{list:int}):
+            pass
+
+        # the list is mutable, so it is checked inline
+        f(list(range(1000)))
+        self.assertEqual(get_stats(f).downgrades, 1)
+
+    def test_bad_degrade(self):
+        self.assertRaises(ValueError, lambda: checked(budget_us=1, degrade='deep')(lambda x: x))
+
+
+class TestStats(unittest.TestCase):
+
+    def test_stats_die_with_their_function(self):
+        @checked
+        def f(x:int):
+            pass
+
+        f(1)
+        stats = weakref.ref(get_stats(f))
+        function = weakref.ref(getattr(f, '__wrapped__', f))
+        self.assertIn(stats(), all_stats())
+        del f
+        gc.collect()
+        self.assertIsNone(function())
+        self.assertIsNone(stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import inspect
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from pycheck import checked, configure, TypeDeclarationViolation
+from pycheck import log, report
+from pycheck.config import Settings
+from pycheck.stats import get_stats, reset_stats
+
+
+@checked
+def area(side:int) -> int:
+    return len(str(side))
+
+def good_caller():
+    return area(2)
+
+def bad_caller():
+    return area('2')
+
+def other_bad_caller():
+    return area(2.0)
+
+
+def line_of(function, text):
+    lines, start = inspect.getsourcelines(function)
+    return start + next(i for i, line in enumerate(lines) if text in line)
+
+
+@unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+class TestCallers(unittest.TestCase):
+
+    def setUp(self):
+        reset_stats()
+        report.reset()
+        configure(callers=True)
+
+    def tearDown(self):
+        configure(callers=False, callers_sample_rate=Settings.callers_sample_rate,
+                  on_violation=Settings.on_violation, profile=False)
+        reset_stats()
+        report.reset()
+
+    def test_message_names_the_caller(self):
+        with self.assertRaises(TypeDeclarationViolation) as raised:
+            bad_caller()
+        self.assertTrue(str(raised.exception).endswith(
+            'Called from %s:%d, in bad_caller().' % (__file__, line_of(bad_caller, "area('2')"))),
+            str(raised.exception))
+
+    def test_not_attributed_unless_configured(self):
+        configure(callers=False)
+        with self.assertRaises(TypeDeclarationViolation) as raised:
+            bad_caller()
+        self.assertNotIn('Called from', str(raised.exception))
+        self.assertEqual(get_stats(area).call_sites, {})
+
+    def test_violations_per_call_site(self):
+        configure(on_violation='log')
+        with self.assertLogs('pycheck', logging.WARNING) as logged:
+            for _ in range(3):
+                bad_caller()
+            other_bad_caller()
+        # one full report per call site
+        self.assertEqual(len(logged.output), 2)
+        sites = sorted((site.key[0].co_name, site.violations) for site in get_stats(area).call_sites.values())
+        self.assertEqual(sites, [('bad_caller', 3), ('other_bad_caller', 1)])
+
+    def test_sampled_calls(self):
+        configure(callers_sample_rate=4, profile=True)
+        for _ in range(8):
+            good_caller()
+        sites = list(get_stats(area).call_sites.values())
+        self.assertEqual([(site.key[0].co_name, site.calls) for site in sites], [('good_caller', 2)])
+        self.assertGreater(sites[0].check_time, 0)
+        self.assertEqual(sites[0].key[1], line_of(good_caller, 'area(2)'))
+
+    def test_method_and_generator_callers(self):
+        class Shape:
+            @checked
+            def scale(self, factor:int):
+                pass
+
+            @checked
+            def sides(self) -> int:
+                yield 1
+                yield 'two'
+
+        def scale_caller():
+            Shape().scale(1.5)
+
+        def sides_caller():
+            return list(Shape().sides())
+
+        for caller in (scale_caller, sides_caller):
+            with self.assertRaises(TypeDeclarationViolation) as raised:
+                caller()
+            self.assertIn('in %s()' % caller.__qualname__, str(raised.exception))
+
+    def test_log_records_call_site(self):
+        directory = tempfile.mkdtemp()
+        violation_log = log.open_log(directory, capacity=8)
+        configure(on_violation='log')
+        try:
+            with self.assertLogs('pycheck', logging.WARNING):
+                bad_caller()
+                other_bad_caller()
+            records = log.read_log(directory)
+        finally:
+            report.remove_sink(violation_log.write)
+            violation_log.close()
+            shutil.rmtree(directory)
+        self.assertEqual([r.caller.rsplit(' ', 1)[-1] for r in records], ['bad_caller()', 'other_bad_caller()'])
+        self.assertIn(', called from %s:' % os.path.abspath(__file__), log.format_record(records[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
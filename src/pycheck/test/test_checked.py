@@ -5,7 +5,10 @@ Created on Dec 22, 2012
 '''
 import unittest
 import sys
+from collections import OrderedDict
+from collections.abc import Sequence, Set
 from pycheck import checked, TypeDeclarationViolation
+from pycheck.checked_helpers import check_collection, find_collection_type, ContainerDeclaration
 
 
 @checked
@@ -80,6 +83,9 @@ def every_type_of_param(required:int, defaulted:float=4.5, *pos:str, **named:str
 def bad_default_val(x:int=1.0):
     pass
 
+class MyList(list):
+    pass
+
 class OldVersionPatchMixin:
     """Mixin class to add some functionality to TestCase which only comes about in 3.2+"""
     if sys.version < '3.2':
@@ -405,6 +411,42 @@ class TestGenerators(unittest.TestCase, OldVersionPatchMixin):
                                "(TestPreconditions\.test_generators\.<locals>\.)?bad_gen\(\) -> <float>: Actual type of return value, <0>, is <str>", 
                                lambda: list(self.bad_gen(10)) )
         
+class TestContainerDispatch(unittest.TestCase, OldVersionPatchMixin):
+
+    def test_find_collection_type(self):
+        self.assertIs(find_collection_type({list:int, tuple:int}, list), list)
+        self.assertIs(find_collection_type({dict:int}, OrderedDict), dict)
+        self.assertIs(find_collection_type({Sequence:int, list:int}, MyList), list)
+        self.assertIs(find_collection_type({Sequence:int}, range), Sequence)
+        self.assertIsNone(find_collection_type({Sequence:int}, set))
+
+    def test_subclasses_accepted(self):
+        @checked
+        def f(x:{list:int}, y:{dict:str}=None, z:{Sequence:float}=()) -> {Set:int}:
+            return frozenset(x)
+
+        self.assertEqual(f(MyList([1, 2])), frozenset([1, 2]))
+        self.assertEqual(f([1], OrderedDict(a=1)), frozenset([1]))
+        self.assertEqual(f([1], z=(1.0, 2.0)), frozenset([1]))
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_subclasses_checked(self):
+        @checked
+        def f(x:{list:int}, z:{Sequence:float}=()):
+            pass
+
+        self.assertRaises(TypeDeclarationViolation, lambda: f(MyList([1.0])))
+        self.assertRaises(TypeDeclarationViolation, lambda: f((1,)))
+        self.assertRaises(TypeDeclarationViolation, lambda: f([1], z=[1]))
+        self.assertRaises(TypeDeclarationViolation, lambda: f([1], z=set([1.0])))
+
+    def test_dispatch_is_cached(self):
+        declaration = ContainerDeclaration({Sequence:int})
+        check_collection(None, None, 'x', MyList([1]), declaration)
+        check_collection(None, None, 'x', MyList([2]), declaration)
+        self.assertEqual(dict(declaration.dispatch.data), {id(MyList): Sequence})
+
+
 #    int_to_int(2.0)
 if __name__ == '__main__':
     import cProfile
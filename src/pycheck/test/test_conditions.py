@@ -0,0 +1,95 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import inspect
+import unittest
+from pycheck import checked, TypeDeclarationViolation
+from pycheck.conditions import make_binder
+
+
+def every_kind(a, b=2, *rest, c, d=4, **named):
+    pass
+
+
+class TestBinder(unittest.TestCase):
+
+    def bind(self, names, *args, **kwds):
+        argspec = inspect.getfullargspec(every_kind)
+        return make_binder(every_kind, argspec, names, result=True)(args, kwds, 'R')
+
+    def test_positional_keyword_and_default(self):
+        self.assertEqual(self.bind(['a', 'b'], 1), (1, 2))
+        self.assertEqual(self.bind(['a', 'b'], 1, 3), (1, 3))
+        self.assertEqual(self.bind(['b', 'a'], a=1, b=3), (3, 1))
+        self.assertEqual(self.bind(['c', 'd'], 1, c=5), (5, 4))
+        self.assertEqual(self.bind(['d'], 1, c=5, d=6), (6,))
+
+    def test_varargs_and_varkw(self):
+        self.assertEqual(self.bind(['rest', 'named'], 1, 2, 3, c=5, x=9), ((3,), {'x': 9}))
+
+    def test_result(self):
+        self.assertEqual(self.bind(['result', 'a'], 1), ('R', 1))
+
+    def test_missing_argument(self):
+        self.assertRaises(KeyError, lambda: self.bind(['a']))
+        self.assertRaises(KeyError, lambda: self.bind(['c'], 1))
+
+    def test_unknown_parameter(self):
+        argspec = inspect.getfullargspec(every_kind)
+        self.assertRaises(TypeError, lambda: make_binder(every_kind, argspec, ['z']))
+        self.assertRaises(TypeError, lambda: make_binder(every_kind, argspec, ['result']))
+
+
+@checked(requires=lambda lo, hi: lo <= hi,
+         ensures=[lambda result, lo: result >= lo, lambda result, hi: result <= hi])
+def clamp(x:int, lo:int=0, hi:int=100) -> int:
+    return x if x < 200 else 200
+
+class Range:
+    @checked(requires=lambda self, n: n < self.size)
+    def get(self, n:int):
+        return n
+
+    size = 10
+
+
+class TestConditions(unittest.TestCase):
+
+    def test_pass(self):
+        self.assertEqual(clamp(5), 5)
+        self.assertEqual(clamp(5, 1, 5), 5)
+        self.assertEqual(clamp(5, hi=5), 5)
+        self.assertEqual(Range().get(9), 9)
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_precondition_fails(self):
+        self.assertRaisesRegex(TypeDeclarationViolation,
+                               r"clamp\(\): lo=5, hi=1: Fails precondition check\.",
+                               lambda: clamp(3, 5, 1))
+        self.assertRaises(TypeDeclarationViolation, lambda: clamp(3, lo=101))
+        self.assertRaises(TypeDeclarationViolation, lambda: Range().get(10))
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_postcondition_fails(self):
+        self.assertRaisesRegex(TypeDeclarationViolation,
+                               r"clamp\(\): result=200, hi=100: Fails postcondition check\.",
+                               lambda: clamp(300))
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_keyword_only_condition_parameters(self):
+        @checked(requires=lambda lo, *, hi: lo <= hi)
+        def between(x:int, lo:int=0, *, hi:int=100):
+            return lo <= x <= hi
+
+        self.assertTrue(between(5, hi=10))
+        self.assertRaisesRegex(TypeDeclarationViolation, r"lo=5, hi=1: Fails precondition check\.",
+                               lambda: between(3, 5, hi=1))
+
+    def test_missing_argument_is_a_type_error(self):
+        self.assertRaises(TypeError, lambda: clamp())
+
+
+if __name__ == "__main__":
+    unittest.main()
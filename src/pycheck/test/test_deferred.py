@@ -0,0 +1,141 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import logging
+import threading
+import unittest
+from collections import namedtuple
+from dataclasses import dataclass
+from pycheck import checked, configure, TypeDeclarationViolation
+from pycheck import deferred, report
+from pycheck.stats import get_stats
+
+
+@dataclass(frozen=True)
+class Frozen:
+    x: int
+
+@dataclass
+class Thawed:
+    x: int
+
+
+class TestIsImmutable(unittest.TestCase):
+
+    def test_immutable(self):
+        for value in (1, 1.0, 'a', b'a', None, True, (1, ('a', None)), frozenset([1, 2]), Frozen(1)):
+            self.assertTrue(deferred.is_immutable(value), value)
+            self.assertTrue(deferred.looks_immutable(value), value)
+
+    def test_mutable(self):
+        Point = namedtuple('Point', 'x y')
+        for value in ([1], {1}, {1: 2}, (1, [2]), (1, Thawed(2)), Thawed(1), Point(1, 2)):
+            self.assertFalse(deferred.is_immutable(value), value)
+        self.assertTrue(deferred.looks_immutable((1, [2])))
+        self.assertFalse(deferred.looks_immutable(Point(1, 2)))
+
+
+@unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+class TestDeferred(unittest.TestCase):
+
+    def setUp(self):
+        report.reset()
+
+    def tearDown(self):
+        deferred.join()
+        report.reset()
+        configure(deferred=False, deferred_mutable='inline')
+
+    def test_immutable_violations_are_reported_later(self):
+        @checked(deferred=True)
+        def f(x:int, y:(str, None)=None) -> int:
+            return x
+
+        with self.assertLogs('pycheck') as logs:
+            self.assertEqual(f(1.5), 1.5)
+            self.assertEqual(f(1, y=2), 1)
+            deferred.join()
+        self.assertEqual(get_stats(f).violations, 3)
+        self.assertEqual(len(logs.output), 3)
+
+    def test_mutable_checked_inline(self):
+        @checked(deferred=True)
+        def f(x:{list:int}):
+            pass
+
+        f([1])
+        self.assertRaises(TypeDeclarationViolation, lambda: f([1.0]))
+
+    def test_mutable_skipped(self):
+        configure(deferred_mutable='skip')
+
+        @checked(deferred=True)
+        def f(x:{list:int}) -> {list:int}:
+            return [str(x)]
+
+        self.assertEqual(f([1.0]), ['[1.0]'])
+
+    def test_global_setting(self):
+        configure(deferred=True)
+
+        @checked
+        def f(x:int):
+            pass
+
+        with self.assertLogs('pycheck'):
+            f('1')
+            deferred.join()
+
+    def test_contents_are_looked_at_later(self):
+        class Box:
+            pass
+
+        @checked(deferred=True)
+        def f(x:{tuple:int}):
+            pass
+
+        # the tuple holds something mutable, so it isn't immutable after all; it is
+        # still checked, but by the background thread
+        with self.assertLogs('pycheck'):
+            f((1, Box()))
+            deferred.join()
+        configure(deferred_mutable='skip')
+        f((1, Box()))
+        deferred.join()
+        self.assertEqual(get_stats(f).violations, 1)
+
+    def test_failing_check_is_logged(self):
+        @checked(deferred=True)
+        def f(x:lambda v: v > 0):
+            pass
+
+        errors = deferred.errors()
+        with self.assertLogs('pycheck', logging.ERROR):
+            f('a')
+            deferred.join()
+        self.assertEqual(deferred.errors(), errors + 1)
+        self.assertTrue(deferred.get_checker().thread.is_alive())
+        with self.assertLogs('pycheck', logging.WARNING):
+            f(-1)
+            deferred.join()
+
+    def test_full_queue_drops_checks(self):
+        checker = deferred.DeferredChecker(maxsize=1)
+        started, release = threading.Event(), threading.Event()
+        def block():
+            started.set()
+            release.wait()
+
+        checker.submit(block, (), None)
+        started.wait()
+        checker.submit(lambda: None, (), None)
+        checker.submit(lambda: None, (), None)
+        release.set()
+        checker.queue.join()
+        self.assertEqual(checker.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
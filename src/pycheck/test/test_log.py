@@ -0,0 +1,107 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pycheck import checked, report
+from pycheck import log
+from pycheck.checked_helpers import raise_error, TypeDeclarationViolation
+
+
+def violation(f, position, argname, argval, declared_types):
+    try:
+        raise_error(f, position, argname, argval, declared_types)
+    except TypeDeclarationViolation as e:
+        return e
+
+def parse(x:int, name:str='', **options:{list:int}):
+    pass
+
+
+class TestViolationLog(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log = log.ViolationLog(self.directory, capacity=4)
+
+    def tearDown(self):
+        self.log.close()
+        shutil.rmtree(self.directory)
+
+    def test_records(self):
+        self.log.write(violation(parse, 1, 'x', 1.5, int))
+        self.log.write(violation(parse, None, 'name', b'n', str))
+        self.log.write(violation(parse, None, 'options', [1.0], {list:int}))
+
+        records = log.read_log(self.directory)
+        self.assertEqual([(r.pid, r.function, r.position, r.argname, r.declared, r.actual) for r in records],
+                         [(os.getpid(), __name__ + '.parse', 1, 'x', 'int', 'float'),
+                          (os.getpid(), __name__ + '.parse', None, 'name', 'str', 'bytes'),
+                          (os.getpid(), __name__ + '.parse', None, 'options', 'list', 'list')])
+
+    def test_same_time(self):
+        with mock.patch.object(log.time, 'time', return_value=1000.0):
+            self.log.write(violation(parse, 1, 'x', 1.5, int))
+            self.log.write(violation(parse, None, 'name', b'n', str))
+        self.assertEqual([r.position for r in log.read_log(self.directory)], [1, None])
+
+    def test_names_are_interned(self):
+        for i in range(3):
+            self.log.write(violation(parse, 1, 'x', i + 0.5, int))
+        with open(os.path.join(self.directory, 'violations.%d.names' % os.getpid())) as names:
+            self.assertEqual(len(names.readlines()), 4)
+
+    def test_ring_keeps_newest(self):
+        for i in range(6):
+            self.log.write(violation(parse, i + 1, 'x', 0.5, int))
+        self.assertEqual([r.position for r in log.read_log(self.directory)], [3, 4, 5, 6])
+
+    def test_cli(self):
+        self.log.write(violation(parse, 1, 'x', 1.5, int))
+        self.log.write(violation(parse, 1, 'x', 2.5, int))
+        self.log.write(violation(parse, None, 'name', b'n', str))
+
+        def run(*argv):
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                log.main([self.directory] + list(argv))
+            return out.getvalue().splitlines()
+
+        self.assertEqual(len(run()), 3)
+        self.assertEqual(len(run('--parameter', 'name')), 1)
+        self.assertEqual(run('--function', 'nothing'), [])
+        self.assertEqual(run('--by', 'function'), ['       3  %s.parse' % __name__])
+        self.assertEqual(run('--by', 'parameter'), ['       2  %s.parse(): x' % __name__,
+                                                    '       1  %s.parse(): name' % __name__])
+
+
+@unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+class TestSink(unittest.TestCase):
+
+    def test_reported_violations_are_logged(self):
+        directory = tempfile.mkdtemp()
+        sink = log.open_log(directory)
+        try:
+            @checked(on_violation='log')
+            def f(x:int):
+                pass
+            with self.assertLogs('pycheck'):
+                for i in range(5):
+                    f(i + 0.5)
+            self.assertEqual(len(log.read_log(directory)), 5)
+        finally:
+            report.remove_sink(sink.write)
+            report.reset()
+            sink.close()
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
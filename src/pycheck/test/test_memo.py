@@ -0,0 +1,93 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import dataclasses
+import unittest
+from pycheck import checked, configure, TypeDeclarationViolation
+from pycheck.config import Settings
+from pycheck.memo import verdicts
+
+
+class CountingMeta(type):
+    checks = 0
+
+    def __instancecheck__(cls, instance):
+        CountingMeta.checks += 1
+        return super().__instancecheck__(instance)
+
+class Shape(metaclass=CountingMeta):
+    pass
+
+@dataclasses.dataclass(frozen=True)
+class Square(Shape):
+    side: int
+
+@dataclasses.dataclass
+class Circle(Shape):
+    radius: int
+
+
+@checked
+def count(shapes:{tuple:Shape, frozenset:Shape}) -> int:
+    return len(shapes)
+
+
+@unittest.skipUnless(__debug__, "@checked only checks in debug mode")
+class TestMemo(unittest.TestCase):
+
+    def setUp(self):
+        verdicts.clear()
+        configure(memo=True)
+        CountingMeta.checks = 0
+
+    def tearDown(self):
+        verdicts.clear()
+        configure(memo=False, memo_size=Settings.memo_size, memo_min_length=Settings.memo_min_length)
+
+    def test_repeat_calls_skip_the_scan(self):
+        squares = tuple(Square(i) for i in range(100))
+        for _ in range(5):
+            count(squares)
+        self.assertEqual(CountingMeta.checks, 100)
+        count(frozenset(squares))
+        self.assertEqual(CountingMeta.checks, 200)
+        # an equal but different tuple is scanned
+        count(squares[:50] + squares[50:])
+        self.assertEqual(CountingMeta.checks, 300)
+
+    def test_mutable_contents_always_scanned(self):
+        circles = tuple(Circle(i) for i in range(20))
+        count(circles)
+        count(circles)
+        self.assertEqual(CountingMeta.checks, 40)
+
+    def test_failures_are_not_remembered(self):
+        shapes = tuple(Square(i) for i in range(20)) + (1,)
+        self.assertRaises(TypeDeclarationViolation, lambda: count(shapes))
+        self.assertRaises(TypeDeclarationViolation, lambda: count(shapes))
+        self.assertEqual(len(verdicts), 0)
+
+    def test_off_and_small(self):
+        configure(memo_min_length=50)
+        squares = tuple(Square(i) for i in range(20))
+        count(squares)
+        count(squares)
+        self.assertEqual(CountingMeta.checks, 40)
+        configure(memo=False, memo_min_length=1)
+        count(squares)
+        count(squares)
+        self.assertEqual(CountingMeta.checks, 80)
+
+    def test_bounded(self):
+        configure(memo_size=3, memo_min_length=1)
+        kept = [tuple(Square(i) for i in range(n)) for n in range(1, 6)]
+        for squares in kept:
+            count(squares)
+        self.assertEqual(len(verdicts), 3)
+        self.assertEqual([verdicts.get(s, Shape) for s in kept], [None, None, True, True, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
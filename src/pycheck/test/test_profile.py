@@ -0,0 +1,119 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pycheck import checked, configure, profile
+from pycheck.stats import get_stats, reset_stats
+
+
+SCRIPT = """
+import sys
+from pycheck import checked
+
+@checked
+def total(values:{list:int}) -> int:
+    return sum(values)
+
+@checked
+def name(x:str=''):
+    return x
+
+for i in range(int(sys.argv[1])):
+    total(list(range(100000)))
+    name(x='a')
+"""
+
+
+class TestDescribe(unittest.TestCase):
+
+    def test_describe(self):
+        self.assertEqual(profile.describe(int), 'int')
+        self.assertEqual(profile.describe({list: int}), '{list:int}')
+        self.assertEqual(profile.describe((int, None)), '(int, None)')
+        self.assertEqual(profile.describe({dict: (str, {list: float})}), '{dict:(str, {list:float})}')
+        self.assertTrue(profile.describe(lambda x: x).endswith('<lambda>'))
+
+
+@unittest.skipUnless(__debug__, "@checked only profiles in debug mode")
+class TestProfile(unittest.TestCase):
+
+    def setUp(self):
+        reset_stats()
+
+    def tearDown(self):
+        configure(profile=False)
+        reset_stats()
+
+    def test_not_timed_unless_profiling(self):
+        @checked
+        def f(x:int):
+            pass
+
+        f(1)
+        self.assertEqual(get_stats(f).calls, 0)
+
+    def test_timing(self):
+        @checked
+        def f(x:{list:int}, *rest:int, y:str='', **named:float) -> int:
+            return 0
+
+        @checked
+        def gen(n:int) -> int:
+            yield from range(n)
+
+        configure(profile=True)
+        for _ in range(3):
+            f([1] * 100, 1, 2, y='a', z=1.0)
+        list(gen(3))
+        stats = get_stats(f)
+        self.assertEqual(stats.calls, 3)
+        self.assertGreater(stats.check_time, 0)
+        self.assertGreaterEqual(stats.total_time, stats.check_time)
+        self.assertEqual(sorted(stats.declaration_time), ['named', 'rest', 'return', 'x', 'y'])
+        self.assertEqual(profile.costliest_declaration(stats)[:2], ('x', '{list:int}'))
+        self.assertEqual(get_stats(gen).calls, 1)
+        self.assertIs(profile.ranked()[0], stats)
+
+    def test_cli(self):
+        directory = tempfile.mkdtemp()
+        paths = [os.path.join(directory, name) for name in ('script.py', 'report.json', 'stacks.txt')]
+        try:
+            with open(paths[0], 'w') as out:
+                out.write(SCRIPT)
+            err = io.StringIO()
+            argv, path = sys.argv[:], sys.path[:]
+            with contextlib.redirect_stderr(err):
+                status = profile.main(['--json', paths[1], '--collapsed', paths[2], paths[0], '5'])
+            self.assertEqual((sys.argv, sys.path), (argv, path))
+            with open(paths[1]) as report:
+                figures = json.load(report)
+            with open(paths[2]) as stacks:
+                lines = stacks.read().splitlines()
+        finally:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+            os.rmdir(directory)
+
+        self.assertEqual(status, 0)
+        table = err.getvalue().splitlines()
+        self.assertIn('costliest declaration', table[1])
+        self.assertIn('__main__.total', table[2])
+        self.assertIn('values:{list:int}', table[2])
+        self.assertEqual([(f['function'], f['calls']) for f in figures],
+                         [('__main__.total', 5), ('__main__.name', 5)])
+        self.assertEqual(figures[0]['declarations'][0]['declaration'], '{list:int}')
+        self.assertTrue(any(line.startswith('__main__.total;values {list:int} ') for line in lines))
+        self.assertTrue(any(line.startswith('__main__.name;x str ') for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
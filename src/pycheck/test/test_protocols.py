@@ -0,0 +1,110 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import gc
+import io
+import typing
+import unittest
+from pycheck import checked, protocol, TypeDeclarationViolation
+from pycheck.protocols import from_typing, protocol_members, replace_protocols
+from pycheck.typecache import TypeCache
+
+
+class Closeable(typing.Protocol):
+    def close(self) -> None: ...
+
+class Reader(Closeable, typing.Protocol):
+    encoding: str
+    def read(self, n:int=-1) -> str: ...
+
+
+class TestTypeCache(unittest.TestCase):
+
+    def test_entries_die_with_their_types(self):
+        cache = TypeCache()
+        cache[int] = 1
+        Temp = type('Temp', (), {})
+        cache[Temp] = 2
+        self.assertEqual((cache[int], cache.get(Temp)), (1, 2))
+        del Temp
+        gc.collect()
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(len(cache._refs), 1)
+
+
+class TestProtocol(unittest.TestCase):
+
+    def test_isinstance(self):
+        Readable = protocol('read', 'close')
+        self.assertIsInstance(io.StringIO(), Readable)
+        self.assertNotIsInstance('not a file', Readable)
+        self.assertTrue(issubclass(io.BytesIO, Readable))
+        self.assertEqual(Readable.__qualname__, 'protocol(read, close)')
+
+    def test_verdicts_are_cached(self):
+        Readable = protocol('read', 'close')
+        class Lazy:
+            def read(self): pass
+        isinstance(Lazy(), Readable)
+        Lazy.close = lambda self: None
+        # the verdict for Lazy was made before it had close()
+        self.assertNotIsInstance(Lazy(), Readable)
+        self.assertEqual(len(Readable.verdicts), 1)
+
+    def test_runtime_types_are_not_kept(self):
+        Readable = protocol('read')
+        for i in range(10):
+            isinstance(type('Temp', (), {'read': None})(), Readable)
+        gc.collect()
+        self.assertEqual(len(Readable.verdicts), 0)
+
+    def test_typing_protocol(self):
+        self.assertEqual(protocol_members(Reader), {'close', 'encoding', 'read'})
+        self.assertIs(from_typing(Reader), from_typing(Reader))
+        self.assertIsInstance(io.StringIO(), from_typing(Reader))
+        self.assertNotIsInstance(object(), from_typing(Reader))
+
+    def test_data_members(self):
+        class Sized(typing.Protocol):
+            size: int
+
+        class Box:
+            size = 1
+
+        @checked
+        def h(s:Sized):
+            pass
+
+        self.assertEqual(protocol_members(Sized), {'size'})
+        h(Box())
+        if __debug__:
+            self.assertRaises(TypeDeclarationViolation, lambda: h(3))
+
+    def test_other_iterables_are_left_alone(self):
+        self.assertIs(replace_protocols(typing.List[int]), typing.List[int])
+        self.assertEqual(replace_protocols(list[int]), list[int])
+        self.assertEqual(replace_protocols({list[int]: Reader}), {list[int]: from_typing(Reader)})
+        self.assertEqual(replace_protocols([Reader, typing.List[int]]),
+                         (from_typing(Reader), typing.List[int]))
+        # and decorating a function annotated with them doesn't recurse for ever
+        def f(x:typing.List[int], y:list[int]):
+            pass
+        checked(f)
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_checked(self):
+        @checked
+        def f(x:(protocol('read'), None), y:{list:Closeable}=()) -> Reader:
+            return x
+
+        self.assertIsNotNone(f(io.StringIO(), [io.BytesIO()]))
+        self.assertRaises(TypeDeclarationViolation, lambda: f('x'))
+        self.assertRaises(TypeDeclarationViolation, lambda: f(io.StringIO(), [1]))
+        self.assertRaisesRegex(TypeDeclarationViolation, 'Declared type=<protocol\\(read\\)',
+                               lambda: f(1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,10 @@ Created on Jan 12, 2013
 
 @author: dev
 '''
+import typing
 import unittest
-from pycheck import type_proxy
+from pycheck import checked, type_proxy, resolve_all, TypeDeclarationViolation
+from pycheck import proxy
 
 
 class A:
@@ -32,6 +34,66 @@ class TestCase(unittest.TestCase):
 #            self.assertTrue(issubclass(PA, A))
 #            self.assertTrue(issubclass(A, PA))
 
+class B:
+    class Inner:
+        pass
+
+
+class TestForwardRefs(unittest.TestCase):
+
+    def test_resolve_name(self):
+        self.assertIs(proxy.resolve_name('collections:OrderedDict'), __import__('collections').OrderedDict)
+        self.assertIs(proxy.resolve_name('B.Inner', __name__), B.Inner)
+        self.assertIs(proxy.resolve_name(__name__ + ':B.Inner'), B.Inner)
+        self.assertRaises(NameError, lambda: proxy.resolve_name('collections:NoSuchThing'))
+        self.assertRaises(NameError, lambda: proxy.resolve_name('B'))
+        self.assertIs(proxy.resolve_name('int', __name__), int)
+        self.assertIs(proxy.resolve_name('A', __name__), A)
+        self.assertRaises(NameError, lambda: proxy.resolve_name('NoSuchThing', __name__))
+
+    def test_declarations_are_patched(self):
+        refs = proxy.forward_refs({'x': 'A', 'y': ('B', None), 'return': {list: __name__ + ':B'}}, __name__)
+        refs.resolve()
+        self.assertEqual(refs.annotations, {'x': A, 'y': (B, None), 'return': {list: B}})
+        self.assertIsNone(proxy.forward_refs({'x': int, 'y': {list: int}}, __name__))
+
+    def test_other_iterables_are_not_declarations(self):
+        # typing generics are iterable, and iterating over list[int] gives list[int]
+        # again; neither holds forward references.
+        self.assertIsNone(proxy.forward_refs({'x': typing.List[int], 'y': list[int]}, __name__))
+        refs = proxy.forward_refs({'x': ['A', list[int]], 'y': {'B': typing.List[int]}}, __name__)
+        refs.resolve()
+        self.assertEqual(refs.annotations, {'x': (A, list[int]), 'y': {B: typing.List[int]}})
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_checked(self):
+        @checked
+        def f(x:'A', y:(__name__ + ':B', None)=None) -> {list:'B'}:
+            return [B()]
+
+        self.assertEqual(len(f(A())), 1)
+        self.assertEqual(len(f(A(), None)), 1)
+        self.assertRaises(TypeDeclarationViolation, lambda: f(B()))
+        self.assertRaises(TypeDeclarationViolation, lambda: f(A(), A()))
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_resolve_all(self):
+        @checked
+        def f(x:'NotDefinedYet'):
+            pass
+
+        global NotDefinedYet
+        self.assertRaises(NameError, resolve_all)
+        class NotDefinedYet:
+            pass
+        try:
+            resolve_all()
+            f(NotDefinedYet())
+            self.assertRaises(TypeDeclarationViolation, lambda: f(A()))
+        finally:
+            del NotDefinedYet
+
+
 if __name__ == "__main__":
     #import sys;sys.argv = ['', 'Test.testName']
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,151 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+
+SHAPES = """
+class Square:
+    def __init__(self, side:(int, float)):
+        self.side = side
+
+    @staticmethod
+    def unit() -> 'shapes:Square':
+        return Square(1)
+
+def area(shape:Square) -> (int, float):
+    return shape.side ** 2
+
+def perimeter(shape):
+    return 'not annotated, so not checked'
+"""
+
+TESTS = """
+import shapes
+
+def test_area():
+    assert shapes.area(shapes.Square.unit()) == 1
+
+def test_not_annotated():
+    shapes.perimeter(None)
+
+def test_bad_side():
+    shapes.Square('1')
+"""
+
+DEFERRED = """
+from pycheck import configure
+import shapes
+
+def test_deferred():
+    configure(deferred=True)
+    try:
+        shapes.area((1,))
+    except AttributeError:
+        pass
+    finally:
+        configure(deferred=False)
+"""
+
+TYPED = """
+from typing import List
+
+def total(values:List[int]) -> int:
+    return sum(values)
+
+def first(values:list[int]) -> int:
+    return values[0]
+
+class Node:
+    def __init__(self):
+        self.next = None
+
+    def link(self, other:'Optional[Node]') -> 'Node':
+        self.next = other
+        return self
+"""
+
+POSTPONED = """
+from __future__ import annotations
+
+def scaled(sides:list[float], factor:int) -> list[float]:
+    return [side * factor for side in sides]
+"""
+
+TYPED_TESTS = """
+import postponed, typed
+
+def test_typing_annotations():
+    assert typed.total([1, 2]) == 3
+    assert typed.first([1]) == 1
+    assert typed.Node().link(None).next is None
+    assert postponed.scaled([1.5], 2) == [3.0]
+"""
+
+
+@unittest.skipUnless(pytest is not None and __debug__, "needs pytest, and debug mode")
+class TestPlugin(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for name, source in (('shapes.py', SHAPES), ('test_shapes.py', TESTS)):
+            with open(os.path.join(self.directory, name), 'w') as out:
+                out.write(source)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_pytest(self, *args):
+        src = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([src, self.directory]))
+        return subprocess.run([sys.executable, '-m', 'pytest', '-p', 'pycheck.pytest_plugin',
+                               '-p', 'no:cacheprovider'] + list(args),
+                              cwd=self.directory, env=env, capture_output=True, text=True).stdout
+
+    def test_checks_chosen_packages(self):
+        out = self.run_pytest('--pycheck=shapes')
+        self.assertIn('1 failed, 2 passed', out)
+        self.assertIn("shapes.Square('1')", out)
+        self.assertIn('TypeDeclarationViolation', out)
+        self.assertNotIn('checked_helpers.py', out)
+        self.assertNotIn('wrapper.py', out)
+        self.assertNotIn('def __call__', out)
+        self.assertIn('pycheck check overhead', out)
+        self.assertIn('shapes.area', out)
+        self.assertIn('test_shapes.py::test_area', out)
+
+    def test_not_checked_without_packages(self):
+        out = self.run_pytest()
+        self.assertIn('3 passed', out)
+        self.assertNotIn('pycheck check overhead', out)
+
+    def test_reported_violations_fail(self):
+        with open(os.path.join(self.directory, 'test_deferred.py'), 'w') as out:
+            out.write(DEFERRED)
+        out = self.run_pytest('--pycheck=shapes', 'test_deferred.py')
+        self.assertIn('1 failed', out)
+        self.assertIn('pycheck reported 1 violation(s)', out)
+
+    def test_typing_annotations_left_alone(self):
+        for name, source in (('typed.py', TYPED), ('postponed.py', POSTPONED), ('test_typed.py', TYPED_TESTS)):
+            with open(os.path.join(self.directory, name), 'w') as out:
+                out.write(source)
+        out = self.run_pytest('--pycheck=typed', '--pycheck=postponed', 'test_typed.py')
+        self.assertIn('1 passed', out)
+        self.assertNotIn('typed.total', out)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import gc
+import unittest
+import weakref
+from pycheck import checked, configure, TypeDeclarationViolation
+from pycheck import report
+from pycheck.checked_helpers import raise_error
+from pycheck.config import Settings
+from pycheck.stats import get_stats
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_rate(self):
+        bucket = report.TokenBucket(rate=1.0, burst=2)
+        now = bucket.stamp
+        self.assertTrue(bucket.take(now))
+        self.assertTrue(bucket.take(now))
+        self.assertFalse(bucket.take(now))
+        self.assertFalse(bucket.take(now + 0.5))
+        self.assertTrue(bucket.take(now + 1.5))
+
+
+@unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+class TestReporting(unittest.TestCase):
+
+    def setUp(self):
+        report.reset()
+        configure(on_violation='log', report_rate=1000.0, report_burst=1000, summary_interval=0.0)
+
+    def tearDown(self):
+        report.reset()
+        configure(on_violation='raise', report_rate=Settings.report_rate,
+                  report_burst=Settings.report_burst, summary_interval=Settings.summary_interval)
+
+    def test_message_is_formatted_lazily(self):
+        def f(x:int):
+            pass
+        try:
+            raise_error(f, 1, 'x', 1.0, int)
+        except TypeDeclarationViolation as e:
+            self.assertEqual(e.args, ())
+            self.assertEqual(e.signature, (f, 1, 'x', int, float, None))
+            self.assertRegex(str(e), r"Parameter number 1, x=1\.0: Declared type=<int>, actual type=<float>\.")
+
+    def test_logged_not_raised(self):
+        @checked
+        def f(x:int) -> int:
+            return x
+
+        with self.assertLogs('pycheck') as logs:
+            self.assertEqual(f(1.5), 1.5)
+        self.assertEqual(len(logs.output), 2) # the parameter, then the return value
+        self.assertRegex(logs.output[0], r"f\(\): Parameter number 1, x=1\.5: Declared type=<int>")
+        self.assertEqual(get_stats(f).violations, 2)
+
+    def test_every_violation_is_reported(self):
+        @checked(requires=lambda lo, hi: lo <= hi, ensures=lambda result: result >= 0)
+        def f(lo:int, hi:int, name:str) -> int:
+            return -1.0
+
+        with self.assertLogs('pycheck') as logs:
+            self.assertEqual(f(1.0, 0, 5), -1.0)
+        # both bad arguments and the precondition, then the return value and the
+        # postcondition
+        self.assertEqual(len(logs.output), 5)
+        self.assertRegex(logs.output[0], r"Parameter number 1, lo=1\.0")
+        self.assertRegex(logs.output[1], r"Parameter number 3, name=5")
+        self.assertRegex(logs.output[2], r"precondition")
+        self.assertRegex(logs.output[3], r"return value")
+        self.assertRegex(logs.output[4], r"postcondition")
+        self.assertEqual(get_stats(f).violations, 5)
+
+    def test_held_back_values_are_not_kept(self):
+        class Big:
+            pass
+
+        @checked
+        def f(x:int):
+            pass
+
+        configure(report_burst=0)
+        value = Big()
+        kept = weakref.ref(value)
+        f(value)
+        del value
+        gc.collect()
+        self.assertIsNone(kept())
+        with self.assertLogs('pycheck') as logs:
+            report.flush()
+        self.assertRegex(logs.output[0], r"x=<.*\.Big>\. \[1 occurrences not reported\]")
+
+    def test_raise_overrides_global_setting(self):
+        @checked(on_violation='raise')
+        def f(x:int):
+            pass
+        self.assertRaises(TypeDeclarationViolation, lambda: f(1.5))
+
+    def test_repeats_are_summarized(self):
+        @checked
+        def f(x:int):
+            pass
+
+        configure(summary_interval=3600)
+        with self.assertLogs('pycheck') as logs:
+            for i in range(100):
+                f(i + 0.5)
+            f('a different actual type')
+        self.assertEqual(len(logs.output), 2)
+
+        with self.assertLogs('pycheck') as logs:
+            report.flush()
+        self.assertEqual(len(logs.output), 1)
+        self.assertRegex(logs.output[0], r"x=0\.5: .*\[repeated 99 more times, 100 in total\]")
+
+    def test_summary_after_interval(self):
+        @checked
+        def f(x:int):
+            pass
+
+        with self.assertLogs('pycheck') as logs:
+            f(0.5)
+            f(1.5)
+        self.assertEqual(len(logs.output), 2)
+        self.assertRegex(logs.output[1], r"\[repeated 1 more times, 2 in total\]")
+
+    def test_per_function_rate_limit(self):
+        @checked(report_rate=0.001, report_burst=1)
+        def f(x:int):
+            pass
+
+        with self.assertLogs('pycheck') as logs:
+            f(0.5)
+            f(1.5)
+            f('x')
+        self.assertEqual(len(logs.output), 1)
+
+        with self.assertLogs('pycheck') as logs:
+            report.flush()
+        self.assertEqual(len(logs.output), 2)
+        self.assertTrue(any(o.endswith('[repeated 1 more times, 2 in total]') for o in logs.output))
+        self.assertTrue(any(o.endswith('[1 occurrences not reported]') for o in logs.output))
+
+    def test_bad_mode(self):
+        self.assertRaises(ValueError, lambda: configure(on_violation='ignore'))
+        self.assertRaises(ValueError, lambda: checked(on_violation='ignore')(lambda x: x))
+        self.assertRaises(TypeError, lambda: configure(no_such_option=1))
+
+    def test_generator(self):
+        @checked
+        def gen() -> int:
+            yield 1
+            yield 'two'
+
+        with self.assertLogs('pycheck'):
+            self.assertEqual(list(gen()), [1, 'two'])
+
+
+if __name__ == "__main__":
+    unittest.main()
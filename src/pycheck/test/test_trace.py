@@ -0,0 +1,163 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+import weakref
+from pycheck import checked, configure
+from pycheck import trace
+from pycheck.config import Settings
+
+
+LEGACY = """
+def scale(values, factor=1):
+    return [v * factor for v in values]
+
+class Shape:
+    def area(self):
+        return 1.0
+    @staticmethod
+    def make(name):
+        return Shape()
+"""
+
+
+@unittest.skipUnless(__debug__, "@checked only traces in debug mode")
+class TestTrace(unittest.TestCase):
+
+    def setUp(self):
+        trace.reset()
+        configure(trace_sample_rate=1)
+
+    def tearDown(self):
+        trace.reset()
+        configure(trace=False, trace_sample_rate=Settings.trace_sample_rate)
+
+    def test_records_types(self):
+        @checked(trace=True)
+        def f(x, items=(), *rest, **named):
+            return x
+
+        f(1, [1, 2, 3.0])
+        f('a', items=(1,), z=None)
+        f(None, [], 'r1', 'r2')
+        recorded = trace.traces()['%s.%s' % (__name__, f.__qualname__)]
+        self.assertEqual(recorded['calls'], 3)
+        self.assertEqual(recorded['types']['x'], {'int': 1, 'str': 1, 'None': 1})
+        self.assertEqual(recorded['types']['items'], {'list': 2, 'tuple': 1})
+        self.assertEqual(recorded['elements']['items'], {'int': 3, 'float': 1})
+        self.assertEqual(recorded['types']['named'], {'None': 1})
+        self.assertEqual(recorded['types']['rest'], {'str': 2})
+        self.assertEqual(recorded['types']['return'], {'int': 1, 'str': 1, 'None': 1})
+
+    def test_sampling(self):
+        configure(trace_sample_rate=10)
+
+        @checked(trace=True)
+        def f(x):
+            pass
+
+        for i in range(100):
+            f(i)
+        recorded = trace.traces()['%s.%s' % (__name__, f.__qualname__)]
+        self.assertEqual((recorded['calls'], recorded['sampled']), (100, 10))
+        self.assertEqual(recorded['types']['x'], {'int': 10})
+
+    def test_global_setting(self):
+        @checked
+        def f(x):
+            pass
+
+        f(1)
+        self.assertEqual(trace.traces(), {})
+        configure(trace=True)
+        f(1)
+        self.assertEqual(len(trace.traces()), 1)
+
+    def test_traces_are_made_when_needed(self):
+        @checked
+        def f(x):
+            pass
+
+        f(1)
+        self.assertNotIn(f.__wrapped__, trace._traces)
+        configure(trace=True)
+        f(1)
+        trace.reset()
+        f(2.0)
+        self.assertEqual(trace.traces()['%s.%s' % (__name__, f.__qualname__)]['types']['x'], {'float': 1})
+        traced = len(trace._traces)
+        function = weakref.ref(f.__wrapped__)
+        del f
+        gc.collect()
+        self.assertIsNone(function())
+        self.assertEqual(len(trace._traces), traced - 1)
+
+    def test_trace_module(self):
+        module = types.ModuleType('legacy_for_trace')
+        exec(LEGACY, vars(module))
+        sys.modules[module.__name__] = module
+        try:
+            trace.trace_module(module)
+            module.scale([1, 2], 2.0)
+            module.Shape.make('square').area()
+        finally:
+            del sys.modules[module.__name__]
+        self.assertEqual(sorted(trace.traces()), ['legacy_for_trace.Shape.area', 'legacy_for_trace.Shape.make',
+                                                  'legacy_for_trace.scale'])
+
+    def test_suggest_and_cli(self):
+        @checked(trace=True)
+        def f(x, items):
+            return x if x else None
+
+        for i in range(4):
+            f(i, [i, float(i)])
+        suggested = trace.suggest(trace.traces()).splitlines()
+        self.assertEqual(suggested[1:], ['    x: int  # int 100.0%',
+                                         '    items: {list:(float, int)}  # list 100.0%; elements: float 50.0%, int 50.0%',
+                                         '    return: (int, None)  # int 75.0%, None 25.0%'])
+
+        suggested = trace.suggest(trace.traces(), style='typing').splitlines()
+        self.assertEqual(suggested[2:], ['    items: List[Union[float, int]]  # list 100.0%; elements: float 50.0%, int 50.0%',
+                                         '    return: Optional[int]  # int 75.0%, None 25.0%'])
+
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'trace.json')
+        try:
+            trace.dump(path)
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                trace.main([path, path])
+        finally:
+            os.remove(path)
+            os.rmdir(directory)
+        self.assertIn('# 8 calls, 8 sampled', out.getvalue())
+        self.assertIn('x: int  # int 100.0%', out.getvalue())
+
+
+class TestCommandLine(unittest.TestCase):
+
+    def test_run_as_module(self):
+        # importing pycheck mustn't import its command line tools, or runpy warns
+        # that they are already imported
+        src = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        env = dict(os.environ, PYTHONPATH=src)
+        for tool in ('pycheck.trace', 'pycheck.profile'):
+            run = subprocess.run([sys.executable, '-W', 'error::RuntimeWarning', '-m', tool, '--help'],
+                                 env=env, capture_output=True, text=True)
+            self.assertEqual((run.returncode, run.stderr), (0, ''))
+
+
+if __name__ == "__main__":
+    unittest.main()
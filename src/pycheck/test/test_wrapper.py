@@ -0,0 +1,170 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import inspect
+import pickle
+import unittest
+from pycheck import checked, TypeDeclarationViolation
+import pycheck.stats
+from pycheck.stats import get_stats
+
+
+@checked
+def module_level(x:int) -> int:
+    '''Docstring'''
+    return x
+
+
+class Shape:
+    def __init__(self, side):
+        self._side = side
+
+    @checked
+    def scaled(self, factor:(int, float)) -> 'Shape':
+        return Shape(self._side * factor)
+
+    @checked
+    @classmethod
+    def unit(cls, side:int=1):
+        return cls(side)
+
+    @classmethod
+    @checked
+    def square(cls, side:int):
+        return cls(side)
+
+    @checked
+    @staticmethod
+    def area_of(side:int) -> int:
+        return side * side
+
+    @staticmethod
+    @checked
+    def perimeter_of(side:int) -> int:
+        return 4 * side
+
+    @checked
+    @property
+    def side(self) -> int:
+        return self._side
+
+    @property
+    @checked
+    def area(self) -> int:
+        return self._side * self._side
+
+    @side.setter
+    @checked
+    def side(self, side:int):
+        self._side = side
+
+    @checked
+    def varargs(self, first:int, *rest:str):
+        return rest
+
+
+class TestDecoratorOrder(unittest.TestCase):
+
+    def test_pass(self):
+        shape = Shape.unit()
+        self.assertEqual(shape.side, 1)
+        self.assertEqual(Shape.square(2).area, 4)
+        self.assertEqual(shape.scaled(3).side, 3)
+        self.assertEqual((Shape.area_of(3), shape.area_of(3)), (9, 9))
+        self.assertEqual((Shape.perimeter_of(3), shape.perimeter_of(3)), (12, 12))
+        self.assertEqual(Shape.scaled(shape, 2).side, 2)
+        self.assertEqual(shape.varargs(1, 'a', 'b'), ('a', 'b'))
+        shape.side = 5
+        self.assertEqual(shape.side, 5)
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_fail(self):
+        shape = Shape(1)
+        self.assertRaises(TypeDeclarationViolation, lambda: Shape.unit('1'))
+        self.assertRaises(TypeDeclarationViolation, lambda: Shape.square(1.0))
+        self.assertRaises(TypeDeclarationViolation, lambda: shape.scaled('2'))
+        self.assertRaises(TypeDeclarationViolation, lambda: Shape.area_of(1.0))
+        self.assertRaises(TypeDeclarationViolation, lambda: shape.perimeter_of(1.0))
+        self.assertRaises(TypeDeclarationViolation, lambda: shape.varargs(1, 'a', 2))
+        self.assertRaises(TypeDeclarationViolation, lambda: Shape(1.0).side)
+        self.assertRaises(TypeDeclarationViolation, lambda: Shape(1.0).area)
+        with self.assertRaises(TypeDeclarationViolation):
+            shape.side = 2.0
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_positions(self):
+        # self counts as parameter number 1, as it always has
+        self.assertRaisesRegex(TypeDeclarationViolation, 'Parameter number 2, factor',
+                               lambda: Shape(1).scaled('2'))
+        self.assertRaisesRegex(TypeDeclarationViolation, 'Parameter number 4, rest',
+                               lambda: Shape(1).varargs(1, 'a', 2))
+
+
+class TestWrapper(unittest.TestCase):
+
+    def test_looks_like_the_function(self):
+        self.assertEqual(module_level.__name__, 'module_level')
+        self.assertEqual(module_level.__qualname__, 'module_level')
+        self.assertEqual(module_level.__module__, __name__)
+        self.assertEqual(module_level.__doc__, 'Docstring')
+        self.assertEqual(str(inspect.signature(module_level)), '(x: int) -> int')
+        self.assertEqual(Shape.unit.__func__.__defaults__, (1,))
+        self.assertIs(pickle.loads(pickle.dumps(module_level)), module_level)
+
+    @unittest.skipUnless(__debug__, "@checked only wraps in debug mode")
+    def test_compact(self):
+        # attributes can be set, as on any function; reads fall back to the function
+        module_level.attribute = 1
+        try:
+            self.assertEqual(module_level.attribute, 1)
+            self.assertFalse(hasattr(module_level.__wrapped__, 'attribute'))
+            module_level.__wrapped__.other = 2
+            self.assertEqual(module_level.other, 2)
+        finally:
+            del module_level.attribute, module_level.__wrapped__.other
+        self.assertIsInstance(Shape.scaled.__get__(Shape(1)), type(Shape(1).scaled))
+        self.assertIs(Shape.scaled.__get__(None, Shape), Shape.scaled)
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_stats_on_demand(self):
+        @checked(on_violation='log')
+        def f(a, b:int, c, d=None) -> int:
+            return b
+
+        # nothing is recorded for a call without violations, so it has no stats yet
+        self.assertEqual(f(1, 2, 3), 2)
+        self.assertNotIn(f.__wrapped__, pycheck.stats._stats)
+        self.assertEqual(f.positional, (None, 'b'))
+        with self.assertLogs('pycheck', 'WARNING'):
+            f(1, '2', 3)
+        self.assertIs(f.stats, get_stats(f))
+        self.assertEqual(f.stats.violations, 2)
+        self.assertEqual(set(f.stats.annotations), {'b', 'return'})
+
+    @unittest.skipUnless(__debug__, "Errors only raised in debug mode")
+    def test_checked_predicate(self):
+        @checked
+        def positive(x:int):
+            return x > 0
+
+        @checked
+        def f(x:positive) -> positive:
+            return x - 1
+
+        self.assertEqual(f(2), 1)
+        self.assertRaisesRegex(TypeDeclarationViolation, 'Fails condition check', lambda: f(-1))
+        self.assertRaisesRegex(TypeDeclarationViolation, 'Fails condition check', lambda: f(1))
+
+    @unittest.skipUnless(__debug__, "@checked only wraps in debug mode")
+    def test_class_attributes(self):
+        # the class's own __module__ and __doc__ aren't hidden by its instances'
+        wrapper = type(module_level)
+        self.assertEqual(wrapper.__module__, 'pycheck.wrapper')
+        self.assertEqual(repr(wrapper), "<class 'pycheck.wrapper.CheckedFunction'>")
+        self.assertTrue(wrapper.__doc__.startswith('A @checked function.'))
+
+
+if __name__ == "__main__":
+    unittest.main()
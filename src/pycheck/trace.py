@@ -0,0 +1,234 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+Observed-type tracing, for finding out what annotations an unannotated module
+should have.
+
+In trace mode (@checked(trace=True), configure(trace=True), or trace_module() for
+all of the functions of a module) @checked records, for one call in every
+settings.trace_sample_rate, the type of each argument and of the return value, and
+the types of a few of the elements of each collection. Types are counted by small
+integer ids, so recording a call is a handful of dict increments.
+
+dump() saves what has been recorded as JSON, and suggest() turns it into suggested
+annotations, with how often each type was seen:
+
+    python -m pycheck.trace trace.json [more.json ...] [--style typing]
+'''
+import argparse
+import collections
+import json
+import sys
+import weakref
+from pycheck.checked_helpers import Iterable, bind_args, get_name, sample_items
+from pycheck.config import settings
+
+# the number of elements of a collection whose types are recorded
+ELEMENT_SAMPLE = 8
+
+_type_ids = {}
+_types = []
+
+def type_id(t):
+    try:
+        return _type_ids[t]
+    except KeyError:
+        _types.append(t)
+        return _type_ids.setdefault(t, len(_types) - 1)
+
+def type_name(t):
+    if t is type(None):
+        return 'None'
+    if t.__module__ == 'builtins':
+        return get_name(t)
+    return '%s.%s' % (t.__module__, get_name(t))
+
+
+class FunctionTrace:
+    '''The types seen in the sampled calls of one function.'''
+    __slots__ = ('name', 'calls', 'sampled', 'countdown', 'types', 'elements')
+
+    def __init__(self, f):
+        self.name = '%s.%s' % (f.__module__, get_name(f))
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.sampled = 0
+        self.countdown = 1
+        # parameter name -> {type id: count}
+        self.types = collections.defaultdict(collections.Counter)
+        # parameter name -> {element type id: count}, for collections
+        self.elements = collections.defaultdict(collections.Counter)
+
+    def sample(self):
+        '''Count a call; return True if it is one to record.'''
+        self.calls += 1
+        self.countdown -= 1
+        if self.countdown > 0:
+            return False
+        self.countdown = settings.trace_sample_rate
+        self.sampled += 1
+        return True
+
+    def record(self, name, value):
+        value_type = type(value)
+        self.types[name][type_id(value_type)] += 1
+        if (isinstance(value, Iterable) and not isinstance(value, (str, bytes, bytearray))
+            and hasattr(value, '__len__')):
+            elements = self.elements[name]
+            for item in sample_items(value, ELEMENT_SAMPLE):
+                elements[type_id(type(item))] += 1
+
+    def record_args(self, args, kwds, argspec):
+        for _, argname, argval in bind_args(args, argspec):
+            self.record(argname, argval)
+        for argname, argval in kwds.items():
+            self.record(argname if argname in argspec.args or argname in argspec.kwonlyargs
+                        else argspec.varkw or argname, argval)
+
+    def as_dict(self):
+        names = lambda counter: dict((type_name(_types[i]), n) for i, n in counter.items())
+        return dict(calls=self.calls, sampled=self.sampled,
+                    types=dict((p, names(c)) for p, c in self.types.items()),
+                    elements=dict((p, names(c)) for p, c in self.elements.items() if c))
+
+
+# Traces are only kept as long as their functions are; @checked fetches a function's
+# trace the first time it is traced.
+_traces = weakref.WeakKeyDictionary()
+
+def get_trace(f):
+    '''Return the FunctionTrace of f, creating it if necessary.'''
+    f = getattr(f, '__wrapped__', f)
+    try:
+        return _traces[f]
+    except KeyError:
+        return _traces.setdefault(f, FunctionTrace(f))
+
+def traces():
+    '''Return what has been recorded so far: a dict of function name to its trace
+    (as FunctionTrace.as_dict()).'''
+    return dict((t.name, t.as_dict()) for t in list(_traces.values()) if t.sampled)
+
+def dump(path):
+    with open(path, 'w') as out:
+        json.dump(traces(), out, indent=1, sort_keys=True)
+
+def reset():
+    '''Forget what has been recorded so far.'''
+    for t in list(_traces.values()):
+        t.reset()
+
+
+def decorate_module(module, decorate, wanted=lambda f: True):
+    '''Replace every function defined in module, and every method of its classes, for
+    which wanted(function) is true with decorate(function), without editing the module.
+    Functions which have already been decorated are left alone.'''
+    def decorated(obj):
+        if isinstance(obj, (staticmethod, classmethod)):
+            return type(obj)(decorate(obj.__func__))
+        return decorate(obj)
+    def is_local_function(obj):
+        obj = getattr(obj, '__func__', obj)
+        return (callable(obj) and getattr(obj, '__module__', None) == module.__name__
+                and hasattr(obj, '__code__') and not hasattr(obj, '__wrapped__') and wanted(obj))
+
+    for name, obj in list(vars(module).items()):
+        if is_local_function(obj):
+            setattr(module, name, decorated(obj))
+        elif isinstance(obj, type) and obj.__module__ == module.__name__:
+            for attr, member in list(vars(obj).items()):
+                if is_local_function(member):
+                    setattr(obj, attr, decorated(member))
+
+def trace_module(module):
+    '''Trace every function defined in module, and the methods of its classes, without
+    editing it: they are replaced by @checked(trace=True) versions. Call it as soon as
+    the module has been imported, before other modules take references to its functions.'''
+    from pycheck import checked
+    decorate_module(module, lambda f: checked(f, trace=True))
+
+
+#===============================================================================
+# Suggestions
+#===============================================================================
+def merge(*trace_dicts):
+    '''Add up several traces() (e.g. from several processes).'''
+    merged = {}
+    for trace_dict in trace_dicts:
+        for name, trace in trace_dict.items():
+            into = merged.setdefault(name, dict(calls=0, sampled=0, types={}, elements={}))
+            into['calls'] += trace['calls']
+            into['sampled'] += trace['sampled']
+            for kind in ('types', 'elements'):
+                for param, counts in trace[kind].items():
+                    param_counts = into[kind].setdefault(param, {})
+                    for t, n in counts.items():
+                        param_counts[t] = param_counts.get(t, 0) + n
+    return merged
+
+def _percentages(counts):
+    total = sum(counts.values())
+    return ', '.join('%s %.1f%%' % (t, 100.0 * n / total)
+                     for t, n in sorted(counts.items(), key=lambda tn: (-tn[1], tn[0])))
+
+_TYPING_CONTAINERS = dict(list='List[%s]', set='Set[%s]', frozenset='FrozenSet[%s]',
+                          tuple='Tuple[%s, ...]', dict='Dict[%s, Any]')
+
+def _annotation(counts, elements, style):
+    types = sorted(counts, key=lambda t: (-counts[t], t))
+    optional = 'None' in types
+    types = [t for t in types if t != 'None']
+    if elements and len(types) == 1:
+        element_types = sorted(elements, key=lambda t: (-elements[t], t))
+        if style == 'typing':
+            element = (element_types[0] if len(element_types) == 1
+                       else 'Union[%s]' % ', '.join(element_types))
+            if types[0] in _TYPING_CONTAINERS:
+                types = [_TYPING_CONTAINERS[types[0]] % element]
+        elif not optional:
+            # pycheck can't combine a collection declaration with None
+            element = element_types[0] if len(element_types) == 1 else '(%s)' % ', '.join(element_types)
+            types = ['{%s:%s}' % (types[0], element)]
+    if style == 'typing':
+        if not types:
+            return 'None'
+        annotation = types[0] if len(types) == 1 else 'Union[%s]' % ', '.join(types)
+        return 'Optional[%s]' % annotation if optional else annotation
+    if optional:
+        types.append('None')
+    return types[0] if len(types) == 1 else '(%s)' % ', '.join(types)
+
+def suggest(trace_dict, style='pycheck'):
+    '''Return suggested annotations for the functions in traces() as text.
+    style is 'pycheck' for pycheck declarations or 'typing' for typing annotations.'''
+    lines = []
+    for name in sorted(trace_dict):
+        trace = trace_dict[name]
+        lines.append('%s  # %d calls, %d sampled' % (name, trace['calls'], trace['sampled']))
+        for param, counts in trace['types'].items():
+            elements = trace['elements'].get(param)
+            comment = _percentages(counts)
+            if elements:
+                comment += '; elements: ' + _percentages(elements)
+            lines.append('    %s: %s  # %s' % (param, _annotation(counts, elements, style), comment))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pycheck.trace',
+                                     description='Suggest annotations from pycheck traces.')
+    parser.add_argument('files', nargs='+', help='traces saved with pycheck.trace.dump()')
+    parser.add_argument('--style', choices=('pycheck', 'typing'), default='pycheck')
+    args = parser.parse_args(argv)
+    trace_dicts = []
+    for path in args.files:
+        with open(path) as trace_file:
+            trace_dicts.append(json.load(trace_file))
+    print(suggest(merge(*trace_dicts), args.style))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+'''
+import functools
+import weakref
+
+
+class TypeCache:
+    '''A table of values computed once per type.
+
+    Entries are keyed by the id of the type, so that looking one up is a single dict
+    lookup (``cache.data[id(t)]``), and are removed when the type is garbage collected,
+    so that types created at runtime aren't kept alive by the table -- and their ids
+    can't be mistaken for those of new types.
+    '''
+    def __init__(self):
+        self.data = {}
+        self._refs = {}
+
+    def __getitem__(self, t):
+        return self.data[id(t)]
+
+    def __setitem__(self, t, value):
+        key = id(t)
+        if key not in self._refs:
+            self._refs[key] = weakref.ref(t, functools.partial(self._forget, key))
+        self.data[key] = value
+
+    def __contains__(self, t):
+        return id(t) in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, t, default=None):
+        return self.data.get(id(t), default)
+
+    def _forget(self, key, ref):
+        self.data.pop(key, None)
+        self._refs.pop(key, None)
+
+    def clear(self):
+        self.data.clear()
+        self._refs.clear()
@@ -0,0 +1,296 @@
+'''
+Created on Oct 19, 2026
+
+@author: Scott Pigman
+
+CheckedFunction, the object @checked replaces a function with.
+
+Everything @checked works out about a function when it is decorated is kept in the
+slots of a single CheckedFunction, rather than in a closure (and the cells, wrapper
+function and copied attribute dict that go with it); a CheckedFunction only gets an
+attribute dict of its own if an attribute is set on it. Like a function, a
+CheckedFunction is a descriptor, so it is bound to an instance when looked up as a
+method.
+
+The positional parameters to check are worked out once, too: only parameters with a
+declaration are looked at, so self and cls cost nothing. Of the function's argspec
+only the fields needed when it is called are kept, and its FunctionStats is only
+fetched once something is recorded in it.
+'''
+import functools
+import sys
+from time import perf_counter
+from types import GeneratorType, MethodType
+from pycheck.checked_helpers import (TypeDeclarationViolation, check_declaration, check_kwds,
+                                     check_return)
+from pycheck.conditions import check_conditions
+from pycheck.config import settings, RAISE
+from pycheck.deferred import defer_args, defer_return
+from pycheck.report import report as report_violation
+from pycheck.stats import get_stats, profile_args, profile_return
+
+
+class _FunctionAttribute(str):
+    '''The value of a class attribute of CheckedFunction, such as __module__, which
+    CheckedFunctions take from their function instead. It is a str so that the class's
+    own __module__ and __doc__ still work (type looks those up without calling
+    __get__).'''
+    def __new__(cls, name, value):
+        self = super().__new__(cls, value)
+        self.name = name
+        return self
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return str(self)
+        return getattr(obj.__wrapped__, self.name)
+
+
+class CheckedFunction:
+    '''A @checked function. The function itself is __wrapped__; its attributes (__name__,
+    __doc__, __defaults__, ...) can be read through the CheckedFunction. Attributes set
+    on the CheckedFunction are its own, as for any function.'''
+    # args, varargs, varkw, kwonlyargs and annotations are those of the function's
+    # argspec; the CheckedFunction is passed as the argspec to the checks.
+    __slots__ = ('__wrapped__', 'args', 'varargs', 'varkw', 'kwonlyargs', 'annotations',
+                 'positional', 'checked_varargs', 'returns', 'refs', 'preconditions',
+                 'postconditions', 'budget', 'bucket', '_stats', 'ftrace', 'on_violation',
+                 'deferred', 'trace', '__dict__', '__weakref__')
+
+    def __init__(self, f, argspec, refs, preconditions, postconditions, budget, bucket,
+                 on_violation, deferred, trace):
+        self.__wrapped__ = f
+        self.args = argspec.args
+        self.varargs = argspec.varargs
+        self.varkw = argspec.varkw
+        self.kwonlyargs = argspec.kwonlyargs or ()
+        self.annotations = annotations = argspec.annotations
+        self.refs = refs
+        # the name of each positional parameter, or None if it has no declaration
+        if all(name in annotations for name in argspec.args):
+            self.positional = argspec.args
+        else:
+            positional = [name if name in annotations else None for name in argspec.args]
+            while positional and positional[-1] is None:
+                positional.pop()
+            self.positional = tuple(positional)
+        self.checked_varargs = argspec.varargs if argspec.varargs in annotations else None
+        self.returns = 'return' in annotations
+        self.preconditions = preconditions
+        self.postconditions = postconditions
+        self.budget = budget
+        self.bucket = bucket
+        self._stats = None
+        # the FunctionTrace, fetched when the function is first traced
+        self.ftrace = None
+        self.on_violation = on_violation
+        self.deferred = deferred
+        self.trace = trace
+
+    @property
+    def stats(self):
+        '''The function's FunctionStats (see pycheck.stats).'''
+        if self._stats is None:
+            self._stats = get_stats(self.__wrapped__)
+            self._stats.annotations = self.annotations
+        return self._stats
+
+    def check_args(self, f, args, sample, violated=None):
+        # The declarations are looked up on every call, since resolving forward
+        # references replaces them.
+        annotations = self.annotations
+        n = len(args)
+        for index, name in enumerate(self.positional):
+            if index >= n:
+                break
+            if name is None:
+                continue
+            try:
+                check_declaration(f, index + 1, name, args[index], annotations[name], sample)
+            except TypeDeclarationViolation as e:
+                if violated is None:
+                    raise
+                violated(e)
+        if self.checked_varargs is not None:
+            declaration = annotations[self.checked_varargs]
+            for index in range(len(self.args), n):
+                try:
+                    check_declaration(f, index + 1, self.checked_varargs, args[index],
+                                      declaration, sample)
+                except TypeDeclarationViolation as e:
+                    if violated is None:
+                        raise
+                    violated(e)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return MethodType(self, obj)
+
+    def __getattr__(self, name):
+        if name == '__wrapped__':
+            raise AttributeError(name)
+        return getattr(self.__wrapped__, name)
+
+    def __reduce__(self):
+        # pickled by name, as the function would be
+        return self.__wrapped__.__qualname__
+
+    def __repr__(self):
+        return '<checked %s>' % repr(self.__wrapped__)[1:-1]
+
+    def must_raise(self, violation, caller=None):
+        '''Return True if the violation should be raised, otherwise report it.'''
+        self.stats.violations += 1
+        if settings.callers:
+            if caller is None:
+                # the caller of __call__ (or whatever is iterating over checked_gen)
+                caller = sys._getframe(2)
+            site = self.stats.call_site(caller.f_code, caller.f_lineno)
+            site.violations += 1
+            violation.call_site = site.key
+        if (self.on_violation or settings.on_violation) == RAISE:
+            return True
+        report_violation(violation, self.bucket)
+        return False
+
+    def report_deferred(self, violation):
+        # Violations found by deferred checks can only be reported, and the call which
+        # caused them is long gone.
+        self.stats.violations += 1
+        report_violation(violation, self.bucket)
+
+    def sample_caller(self):
+        '''Return the CallSite of the caller of __call__ if this call is one of the
+        sampled ones, otherwise None.'''
+        stats = self.stats
+        stats.caller_countdown -= 1
+        if stats.caller_countdown > 0 or not settings.callers_sample_rate:
+            return None
+        stats.caller_countdown = settings.callers_sample_rate
+        caller = sys._getframe(2)
+        site = stats.call_site(caller.f_code, caller.f_lineno)
+        site.calls += 1
+        return site
+
+    def __call__(self, *args, **kwds):
+        f = self.__wrapped__
+        refs = self.refs
+        if refs is not None and not refs.resolved:
+            refs.resolve()
+        budget = self.budget
+        profiling = settings.profile
+        timed = budget is not None or profiling
+        if timed:
+            start = perf_counter()
+            sample = None if budget is None else budget.sample_size(start)
+        else:
+            sample = None
+        site = self.sample_caller() if settings.callers else None
+        defer = settings.deferred if self.deferred is None else self.deferred
+        traced = False
+        if settings.trace if self.trace is None else self.trace:
+            if self.ftrace is None:
+                # imported here so that importing pycheck doesn't import the
+                # pycheck.trace command line tool
+                from pycheck.trace import get_trace
+                self.ftrace = get_trace(f)
+            traced = self.ftrace.sample()
+            if traced:
+                self.ftrace.record_args(args, kwds, self)
+
+        # When violations are reported rather than raised, each one is reported as it
+        # is found and the rest of the checks are still made.
+        if (self.on_violation or settings.on_violation) == RAISE:
+            violated = None
+        else:
+            violated = functools.partial(self.must_raise, caller=sys._getframe(1))
+        try:
+            if defer:
+                defer_args(f, args, kwds, self, sample, self.report_deferred, violated)
+            elif profiling:
+                profile_args(f, args, kwds, self, sample, self.stats, violated)
+            else:
+                self.check_args(f, args, sample, violated)
+                if kwds:
+                    check_kwds(f, kwds, self, sample, violated)
+            if self.preconditions:
+                check_conditions(f, 'precondition', self.preconditions, args, kwds, None, violated)
+        except TypeDeclarationViolation as e:
+            # It would be confusing to the user to see a big stack of our function calls
+            # here in the stack trace when an error is detected, so if we're in 3.3 or higher
+            # we supress the rest of our own stack trace by the "raise Exception from None"
+            # technique.
+            if self.must_raise(e):
+                raise TypeDeclarationViolation(str(e)) from (None if sys.version_info >= (3, 3) else e)
+
+        if timed:
+            elapsed = perf_counter() - start
+
+        # Since errors thrown here have to do with the actual implementation of the
+        # checked function, f, we don't want to re-wrap any exceptions thrown
+        # since they are actually caused by the user's code.
+        rvalue = f(*args, **kwds)
+        if timed:
+            returned = perf_counter()
+        try:
+            if isinstance(rvalue, GeneratorType):
+                # only the checks of the arguments are timed for generators
+                if budget is not None:
+                    budget.charge(returned, elapsed, sample, self.stats)
+                if profiling:
+                    self.stats.account(elapsed, returned - start)
+                    if site is not None:
+                        site.check_time += elapsed
+                return self.checked_gen(rvalue, defer, sample)
+            elif not timed:
+                if defer:
+                    defer_return(f, rvalue, self, sample, self.report_deferred)
+                elif self.returns:
+                    check_return(f, rvalue, self)
+            else:
+                try:
+                    # deferring is charged too: mutable values are still checked inline
+                    if defer:
+                        defer_return(f, rvalue, self, sample, self.report_deferred)
+                    elif profiling:
+                        profile_return(f, rvalue, self, sample, self.stats)
+                    else:
+                        check_return(f, rvalue, self, sample)
+                finally:
+                    now = perf_counter()
+                    check_time = elapsed + (now - returned)
+                    if budget is not None:
+                        budget.charge(now, check_time, sample, self.stats)
+                    if profiling:
+                        self.stats.account(check_time, now - start)
+                        if site is not None:
+                            site.check_time += check_time
+            if self.postconditions:
+                check_conditions(f, 'postcondition', self.postconditions, args, kwds, rvalue, violated)
+        except TypeDeclarationViolation as e:
+            if self.must_raise(e):
+                raise TypeDeclarationViolation(str(e)) from (None if sys.version_info >= (3, 3) else e)
+            if self.postconditions:
+                # the return value was reported; its postconditions are still checked
+                check_conditions(f, 'postcondition', self.postconditions, args, kwds, rvalue, violated)
+        if traced:
+            self.ftrace.record('return', rvalue)
+        return rvalue
+
+    def checked_gen(self, rvalue, defer, sample):
+        f = self.__wrapped__
+        for value in rvalue:
+            try:
+                if defer:
+                    defer_return(f, value, self, sample, self.report_deferred)
+                else:
+                    check_return(f, value, self, sample)
+            except TypeDeclarationViolation as e:
+                if self.must_raise(e):
+                    raise
+            yield value
+
+
+CheckedFunction.__doc__ = _FunctionAttribute('__doc__', CheckedFunction.__doc__)
+CheckedFunction.__module__ = _FunctionAttribute('__module__', CheckedFunction.__module__)